@@ -2,30 +2,44 @@
 Example agent tool integration for unju-agent
 """
 
-from typing import Literal, Optional
-from unju_perps import PerpTrader
+import asyncio
+import threading
+from typing import Any, Callable, Literal, Optional
+from unju_perps import PerpTrader, UnjuPerpsError
 from unju_perps.types import RiskLimits
 
 
+ALLOWED_SYMBOLS = frozenset({"BTC", "ETH", "SOL", "ARB", "OP"})
+
 # Initialize trader (in real usage, this would be a singleton or per-agent instance)
-_trader = None
+_trader: Optional[PerpTrader] = None
+_trader_lock = threading.Lock()
 
 
 def get_trader() -> PerpTrader:
-    """Get or create PerpTrader instance"""
+    """Get or create PerpTrader instance (safe to call from several threads)"""
     global _trader
     if _trader is None:
-        _trader = PerpTrader(
-            testnet=True,
-            risk_limits=RiskLimits(
-                max_position_size_usd=5000.0,
-                max_leverage=10.0,
-                allowed_symbols=["BTC", "ETH", "SOL", "ARB", "OP"],
-            )
-        )
+        with _trader_lock:
+            if _trader is None:
+                _trader = PerpTrader(
+                    testnet=True,
+                    risk_limits=RiskLimits(
+                        max_position_size_usd=5000.0,
+                        max_leverage=10.0,
+                        allowed_symbols=ALLOWED_SYMBOLS,
+                    )
+                )
     return _trader
 
 
+async def get_trader_async() -> PerpTrader:
+    """Get or create PerpTrader instance without blocking the event loop"""
+    if _trader is not None:
+        return _trader
+    return await asyncio.to_thread(get_trader)
+
+
 def trade_perp(
     symbol: str,
     action: Literal["long", "short", "close"],
@@ -77,27 +91,26 @@ def trade_perp(
                 take_profit_pct=take_profit_pct,
             )
             position = trader.get_position(symbol)
-        
-        return {
-            "status": "success",
-            "order_id": order.id,
-            "symbol": symbol,
-            "side": order.side.value,
-            "entry_price": order.average_price,
-            "size": order.filled_size,
-            "fees": order.fees,
-            "pnl": position.unrealized_pnl if position else 0.0,
-            "liquidation_price": position.liquidation_price if position else None,
-            "message": f"{'Opened' if action != 'close' else 'Closed'} {symbol} {action} position at ${order.average_price:.2f}",
-        }
-    
-    except Exception as e:
+    except (UnjuPerpsError, ValueError) as e:
         return {
             "status": "error",
             "symbol": symbol,
             "action": action,
             "message": f"Trade failed: {str(e)}",
         }
+    
+    return {
+        "status": "success",
+        "order_id": order.id,
+        "symbol": symbol,
+        "side": order.side.value,
+        "entry_price": order.average_price,
+        "size": order.filled_size,
+        "fees": order.fees,
+        "pnl": position.unrealized_pnl if position else 0.0,
+        "liquidation_price": position.liquidation_price if position else None,
+        "message": f"{'Opened' if action != 'close' else 'Closed'} {symbol} {action} position at ${order.average_price:.2f}",
+    }
 
 
 def get_perp_positions() -> dict:
@@ -114,38 +127,35 @@ def get_perp_positions() -> dict:
     
     try:
         positions = trader.get_all_positions()
-        
-        position_list = []
-        total_pnl = 0.0
-        total_margin = 0.0
-        
-        for pos in positions:
-            position_list.append({
-                "symbol": pos.symbol,
-                "side": pos.side.value,
-                "size": pos.size,
-                "entry_price": pos.entry_price,
-                "mark_price": pos.mark_price,
-                "leverage": pos.leverage,
-                "unrealized_pnl": pos.unrealized_pnl,
-                "liquidation_price": pos.liquidation_price,
-            })
-            total_pnl += pos.unrealized_pnl
-            total_margin += pos.margin
-        
-        return {
-            "status": "success",
-            "positions": position_list,
-            "total_pnl": total_pnl,
-            "total_margin": total_margin,
-            "message": f"{len(positions)} open position(s), total PnL: ${total_pnl:.2f}",
-        }
-    
-    except Exception as e:
+    except (UnjuPerpsError, ValueError) as e:
         return {
             "status": "error",
             "message": f"Failed to fetch positions: {str(e)}",
         }
+    
+    position_list = [
+        {
+            "symbol": pos.symbol,
+            "side": pos.side.value,
+            "size": pos.size,
+            "entry_price": pos.entry_price,
+            "mark_price": pos.mark_price,
+            "leverage": pos.leverage,
+            "unrealized_pnl": pos.unrealized_pnl,
+            "liquidation_price": pos.liquidation_price,
+        }
+        for pos in positions
+    ]
+    total_pnl = sum((pos.unrealized_pnl for pos in positions), 0.0)
+    total_margin = sum((pos.margin for pos in positions), 0.0)
+    
+    return {
+        "status": "success",
+        "positions": position_list,
+        "total_pnl": total_pnl,
+        "total_margin": total_margin,
+        "message": f"{len(positions)} open position(s), total PnL: ${total_pnl:.2f}",
+    }
 
 
 def get_perp_market(symbol: str) -> dict:
@@ -167,21 +177,85 @@ def get_perp_market(symbol: str) -> dict:
     
     try:
         market = trader.get_market_data(symbol)
-        
-        return {
-            "status": "success",
-            "symbol": symbol,
-            "mark_price": market.mark_price,
-            "index_price": market.index_price,
-            "funding_rate": market.funding_rate * 100,  # As percentage
-            "volume_24h": market.volume_24h,
-            "change_24h": market.change_24h,
-            "message": f"{symbol}: ${market.mark_price:.2f} ({market.change_24h:+.2f}% 24h)",
-        }
-    
-    except Exception as e:
+    except (UnjuPerpsError, ValueError) as e:
         return {
             "status": "error",
             "symbol": symbol,
             "message": f"Failed to fetch market data: {str(e)}",
         }
+    
+    return {
+        "status": "success",
+        "symbol": symbol,
+        "mark_price": market.mark_price,
+        "index_price": market.index_price,
+        "funding_rate": market.funding_rate * 100,  # As percentage
+        "volume_24h": market.volume_24h,
+        "change_24h": market.change_24h,
+        "message": f"{symbol}: ${market.mark_price:.2f} ({market.change_24h:+.2f}% 24h)",
+    }
+
+
+async def _fan_out(
+    func: Callable[..., dict],
+    calls: list[dict],
+    max_concurrency: Optional[int] = None,
+) -> list[dict]:
+    """Run func once per kwargs dict in worker threads, at most max_concurrency at a time."""
+    semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency else None
+    
+    async def run(kwargs: dict[str, Any]) -> dict:
+        if semaphore is None:
+            return await asyncio.to_thread(func, **kwargs)
+        async with semaphore:
+            return await asyncio.to_thread(func, **kwargs)
+    
+    return list(await asyncio.gather(*(run(kwargs) for kwargs in calls)))
+
+
+async def get_perp_markets(
+    symbols: list[str],
+    max_concurrency: Optional[int] = None,
+) -> list[dict]:
+    """
+    Get market data for several perpetual futures symbols at once.
+    
+    Requests are issued concurrently, so asking for BTC, ETH and SOL costs
+    one round trip instead of three.
+    
+    Args:
+        symbols: Asset symbols (e.g., ["BTC", "ETH", "SOL"])
+        max_concurrency: Optional cap on in-flight requests
+    
+    Returns:
+        List of get_perp_market results, in the same order as symbols
+    """
+    return await _fan_out(
+        get_perp_market,
+        [{"symbol": symbol} for symbol in symbols],
+        max_concurrency,
+    )
+
+
+async def trade_perps(
+    orders: list[dict],
+    max_concurrency: Optional[int] = None,
+) -> list[dict]:
+    """
+    Execute several perpetual futures trades at once.
+    
+    Args:
+        orders: List of trade_perp keyword arguments, e.g.
+            [{"symbol": "BTC", "action": "long", "size_usd": 100.0}]
+        max_concurrency: Optional cap on in-flight orders
+    
+    Returns:
+        List of trade_perp results, in the same order as orders
+    
+    Examples:
+        >>> await trade_perps([
+        ...     {"symbol": "BTC", "action": "long", "size_usd": 100.0},
+        ...     {"symbol": "ETH", "action": "short", "size_usd": 50.0},
+        ... ])
+    """
+    return await _fan_out(trade_perp, orders, max_concurrency)
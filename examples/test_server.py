@@ -9,6 +9,9 @@ import asyncio
 from unju_perps import PerpTrader
 from unju_perps.types import OrderSide
 
+# Shared formatter for every dollar amount printed by the demo
+_usd = "${:,.2f}".format
+
 
 async def demo():
     """Demo the trading client with mock data."""
@@ -25,8 +28,8 @@ async def demo():
     print(f"\n💰 Initial Balance")
     print("-" * 60)
     balance = trader.get_balance()
-    print(f"Total: ${balance.total:,.2f}")
-    print(f"Available: ${balance.available:,.2f}")
+    print(f"Total: {_usd(balance.total)}")
+    print(f"Available: {_usd(balance.available)}")
     
     # Place a market order
     print(f"\n📈 Placing Market Order: Long BTC $1000")
@@ -37,7 +40,7 @@ async def demo():
         size_usd=1000.0
     )
     print(f"Order ID: {order.id}")
-    print(f"Filled: {order.filled_size:.6f} BTC @ ${order.average_price:,.2f}")
+    print(f"Filled: {order.filled_size:.6f} BTC @ {_usd(order.average_price)}")
     print(f"Fees: ${order.fees:.2f}")
     
     # Check position
@@ -48,9 +51,9 @@ async def demo():
         print(f"Symbol: {position.symbol}")
         print(f"Side: {position.side.value.upper()}")
         print(f"Size: {position.size:.6f}")
-        print(f"Entry: ${position.entry_price:,.2f}")
-        print(f"Current: ${position.mark_price:,.2f}")
-        print(f"Liquidation: ${position.liquidation_price:,.2f}")
+        print(f"Entry: {_usd(position.entry_price)}")
+        print(f"Current: {_usd(position.mark_price)}")
+        print(f"Liquidation: {_usd(position.liquidation_price)}")
         print(f"Leverage: {position.leverage}x")
         print(f"P&L: ${position.unrealized_pnl:+,.2f}")
     
@@ -61,7 +64,7 @@ async def demo():
     for pos in positions:
         pnl_pct = (pos.unrealized_pnl / (pos.size * pos.entry_price)) * 100
         print(f"{pos.symbol:6s} {pos.side.value.upper():5s} | "
-              f"Entry: ${pos.entry_price:,.2f} | "
+              f"Entry: {_usd(pos.entry_price)} | "
               f"P&L: ${pos.unrealized_pnl:+.2f} ({pnl_pct:+.2f}%)")
     
     # Place another order
@@ -72,23 +75,23 @@ async def demo():
         side=OrderSide.LONG,
         size_usd=500.0
     )
-    print(f"Filled: {order2.filled_size:.6f} ETH @ ${order2.average_price:,.2f}")
+    print(f"Filled: {order2.filled_size:.6f} ETH @ {_usd(order2.average_price)}")
     
     # Final balance
     print(f"\n💰 Final Balance")
     print("-" * 60)
     balance = trader.get_balance()
-    print(f"Total: ${balance.total:,.2f}")
-    print(f"Available: ${balance.available:,.2f}")
-    print(f"Margin Used: ${balance.margin_used:,.2f}")
+    print(f"Total: {_usd(balance.total)}")
+    print(f"Available: {_usd(balance.available)}")
+    print(f"Margin Used: {_usd(balance.margin_used)}")
     print(f"Unrealized P&L: ${balance.unrealized_pnl:+,.2f}")
     
     # Market data
     print(f"\n📊 Market Data (BTC)")
     print("-" * 60)
     market = trader.get_market_data("BTC")
-    print(f"Mark Price: ${market.mark_price:,.2f}")
-    print(f"Index Price: ${market.index_price:,.2f}")
+    print(f"Mark Price: {_usd(market.mark_price)}")
+    print(f"Index Price: {_usd(market.index_price)}")
     print(f"Funding Rate: {market.funding_rate * 100:.4f}%")
     print(f"24h Volume: ${market.volume_24h:,.0f}")
     print(f"24h Change: {market.change_24h:+.2f}%")
@@ -97,7 +100,7 @@ async def demo():
     print(f"\n❌ Closing BTC Position")
     print("-" * 60)
     close_order = trader.close_position("BTC")
-    print(f"Closed at: ${close_order.average_price:,.2f}")
+    print(f"Closed at: {_usd(close_order.average_price)}")
     print(f"Fees: ${close_order.fees:.2f}")
     
     # Final positions
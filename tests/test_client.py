@@ -1,8 +1,16 @@
 """Tests for PerpTrader client"""
 
+import asyncio
+from datetime import datetime, timezone
+
 import pytest
 from unju_perps import PerpTrader
-from unju_perps.types import RiskLimits
+from unju_perps import client
+from unju_perps._ws import parse_mids
+from unju_perps.types import RiskLimits, OrderSide, Position
+from unju_perps.exceptions import InvalidSymbolError
+
+MOCK_KEY = "0x" + "1" * 64
 
 
 def test_init_without_key():
@@ -12,6 +20,15 @@ def test_init_without_key():
     assert trader.account is None
 
 
+def test_account_derived_lazily():
+    """Test the account is only derived when first needed"""
+    trader = PerpTrader(private_key=MOCK_KEY, testnet=True)
+    assert trader._account is None
+    assert trader.address.startswith("0x")
+    assert trader.account is trader.account
+    assert PerpTrader(private_key=MOCK_KEY).account is trader.account
+
+
 def test_init_with_risk_limits():
     """Test initialization with custom risk limits"""
     limits = RiskLimits(
@@ -23,4 +40,159 @@ def test_init_with_risk_limits():
     assert trader.risk_limits.max_leverage == 5.0
 
 
+def test_balance_reflects_position_pnl():
+    """Test unrealized PnL is refreshed from mark prices"""
+    trader = PerpTrader(private_key=MOCK_KEY, testnet=True)
+    trader.market_order("BTC", OrderSide.LONG, 1000.0)
+    trader.market_order("ETH", OrderSide.SHORT, 500.0)
+    
+    trader._mark[client._SYMBOL_IDX["BTC"]] *= 1.1
+    trader._mark[client._SYMBOL_IDX["ETH"]] *= 1.1
+    
+    balance = trader.get_balance()
+    assert balance.unrealized_pnl == pytest.approx(100.0 - 50.0)
+    assert balance.margin_used == pytest.approx(150.0)
+    
+    trader.close_position("ETH")
+    assert [p.symbol for p in trader.get_all_positions()] == ["BTC"]
+    assert trader.get_balance().unrealized_pnl == pytest.approx(100.0)
+
+
+def test_balance_cache_invalidated_by_orders():
+    """Test cached balance is dropped when positions change"""
+    trader = PerpTrader(private_key=MOCK_KEY, testnet=True)
+    assert trader.get_balance() is trader.get_balance()
+    
+    trader.market_order("SOL", OrderSide.LONG, 100.0)
+    assert trader.get_balance().margin_used == pytest.approx(10.0)
+
+
+def test_orders_in_same_symbol_share_one_position():
+    """Test repeated orders add to the existing position"""
+    trader = PerpTrader(private_key=MOCK_KEY, testnet=True)
+    trader.market_order("BTC", OrderSide.LONG, 1000.0)
+    trader.market_order("BTC", OrderSide.LONG, 500.0)
+    
+    positions = trader.get_all_positions()
+    assert len(positions) == 1
+    assert positions[0].margin == pytest.approx(150.0)
+    assert positions[0].size * positions[0].entry_price == pytest.approx(1500.0)
+
+
+def test_opposite_order_reduces_then_flips():
+    """Test an opposite-side order reduces, closes, then flips the position"""
+    trader = PerpTrader(private_key=MOCK_KEY, testnet=True)
+    trader.market_order("BTC", OrderSide.LONG, 1000.0)
+    
+    trader.market_order("BTC", OrderSide.SHORT, 400.0)
+    position = trader.get_position("BTC")
+    assert position.side is OrderSide.LONG
+    assert position.size * position.entry_price == pytest.approx(600.0)
+    assert position.margin == pytest.approx(60.0)
+    
+    trader.market_order("BTC", OrderSide.SHORT, 1000.0)
+    position = trader.get_position("BTC")
+    assert position.side is OrderSide.SHORT
+    assert position.size * position.entry_price == pytest.approx(400.0)
+    assert trader.risk_manager.total_notional == pytest.approx(400.0)
+    
+    trader.market_order("BTC", OrderSide.LONG, 400.0)
+    assert trader.get_position("BTC") is None
+    assert trader.get_balance().margin_used == pytest.approx(0.0)
+
+
+def test_order_ids_unique_and_timestamps_utc():
+    """Test back-to-back orders get distinct ids and aware timestamps"""
+    trader = PerpTrader(private_key=MOCK_KEY, testnet=True)
+    first = trader.market_order("ETH", OrderSide.LONG, 100.0)
+    second = trader.market_order("ETH", OrderSide.LONG, 100.0)
+    
+    assert first.id != second.id
+    assert first.timestamp.tzinfo is not None
+
+
+def test_liquidation_price_side():
+    """Test liquidation sits below entry for longs and above for shorts"""
+    trader = PerpTrader(private_key=MOCK_KEY, testnet=True)
+    long_liq = trader._calculate_liquidation_price(100.0, 10.0, OrderSide.LONG)
+    short_liq = trader._calculate_liquidation_price(100.0, 10.0, OrderSide.SHORT)
+    
+    assert long_liq == pytest.approx(90.5)
+    assert short_liq == pytest.approx(109.5)
+
+
+def test_exposure_tracks_open_positions():
+    """Test running exposure follows orders and closes"""
+    trader = PerpTrader(private_key=MOCK_KEY, testnet=True)
+    trader.market_order("BTC", OrderSide.LONG, 1000.0)
+    trader.market_order("ETH", OrderSide.SHORT, 500.0)
+    assert trader.risk_manager.total_notional == pytest.approx(1500.0)
+    
+    trader.close_position("BTC")
+    assert trader.risk_manager.total_notional == pytest.approx(500.0)
+
+
+def test_market_order_async_fills_concurrent_orders():
+    """Test concurrent async orders are filled and errors reach their caller"""
+    trader = PerpTrader(private_key=MOCK_KEY, testnet=True)
+    
+    async def place():
+        results = await asyncio.gather(
+            trader.market_order_async("BTC", OrderSide.LONG, 1000.0),
+            trader.market_order_async("ETH", OrderSide.SHORT, 500.0),
+            trader.market_order_async("DOGE", OrderSide.LONG, 100.0),
+            return_exceptions=True,
+        )
+        await trader.aclose()
+        return results
+    
+    btc, eth, doge = asyncio.run(place())
+    assert btc.symbol == "BTC" and eth.symbol == "ETH"
+    assert isinstance(doge, InvalidSymbolError)
+    assert {p.symbol for p in trader.get_all_positions()} == {"BTC", "ETH"}
+
+
+def test_market_order_accepts_side_strings():
+    """Test string sides are normalized and bad sides rejected"""
+    trader = PerpTrader(private_key=MOCK_KEY, testnet=True)
+    assert trader.market_order("BTC", "LONG", 100.0).side is OrderSide.LONG
+    assert trader.market_order("ETH", "short", 100.0).side is OrderSide.SHORT
+    
+    with pytest.raises(ValueError):
+        trader.market_order("SOL", "sideways", 100.0)
+
+
+def test_market_feed_updates_marks():
+    """Test allMids frames update mark prices"""
+    trader = PerpTrader(private_key=MOCK_KEY, testnet=True)
+    trader.market_order("BTC", "long", 1000)
+    
+    frame = b'{"channel":"allMids","data":{"mids":{"BTC":"52000.0","DOGE":"0.1"}}}'
+    trader._apply_mids(parse_mids(frame))
+    
+    # Should pass - new mark flows into position PnL, unknown coins are ignored
+    assert trader.get_market_data("BTC").mark_price == 52000.0
+    assert trader.get_all_positions()[0].unrealized_pnl > 0
+    assert parse_mids(b'{"channel":"pong"}') is None
+
+
+def test_position_from_string_side():
+    """Test string sides are coerced to OrderSide"""
+    position = Position(
+        symbol="BTC",
+        side="long",
+        size=0.1,
+        entry_price=50000.0,
+        mark_price=51000.0,
+        leverage=1.0,
+        unrealized_pnl=0.0,
+        margin=5000.0,
+        timestamp=datetime.now(timezone.utc),
+    )
+    
+    # Should pass - a long from a string profits when the mark rises
+    assert position.side is OrderSide.LONG
+    assert position.side_sign == 1.0
+
+
 # TODO: Add more tests once Hyperliquid SDK integration is complete
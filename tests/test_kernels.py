@@ -0,0 +1,32 @@
+"""Tests for numeric kernels"""
+
+import numpy as np
+import pytest
+from unju_perps._kernels import downsample_ohlc, pnl_pct_vec
+
+
+def test_pnl_pct_vec():
+    """Test PnL percentage per position"""
+    pnl = np.array([5.0, -2.5])
+    size = np.array([0.1, 2.0])
+    entry = np.array([500.0, 25.0])
+    
+    assert pnl_pct_vec(pnl, size, entry).tolist() == pytest.approx([10.0, -5.0])
+
+
+def test_downsample_ohlc():
+    """Test ticks are bucketed into candles"""
+    timestamps = np.array([0.0, 10.0, 50.0, 130.0, 170.0])
+    prices = np.array([1.0, 3.0, 2.0, 5.0, 4.0])
+    
+    starts, ohlc = downsample_ohlc(timestamps, prices, 60)
+    
+    assert starts.tolist() == [0.0, 60.0, 120.0]
+    assert ohlc[0].tolist() == [1.0, 3.0, 1.0, 2.0]
+    assert np.isnan(ohlc[1]).all()
+    assert ohlc[2].tolist() == [5.0, 5.0, 4.0, 4.0]
+    
+    # Should pass with no ticks
+    starts, ohlc = downsample_ohlc(np.array([]), np.array([]), 60)
+    assert starts.shape == (0,)
+    assert ohlc.shape == (0, 4)
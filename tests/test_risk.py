@@ -13,11 +13,24 @@ def test_position_size_limit():
     risk = RiskManager(limits)
     
     # Should pass
-    risk.check_position_size("BTC", 500.0, [])
+    risk.check_position_size("BTC", 500.0, 0.0)
     
     # Should fail
     with pytest.raises(RiskLimitExceededError):
-        risk.check_position_size("BTC", 2000.0, [])
+        risk.check_position_size("BTC", 2000.0, 0.0)
+
+
+def test_total_exposure_limit():
+    """Test total exposure is capped at 5x the position limit"""
+    limits = RiskLimits(max_position_size_usd=1000.0)
+    risk = RiskManager(limits)
+    
+    # Should pass
+    risk.check_position_size("ETH", 1000.0, 4000.0)
+    
+    # Should fail
+    with pytest.raises(RiskLimitExceededError):
+        risk.check_position_size("ETH", 500.0, 4600.0)
 
 
 def test_leverage_limit():
@@ -44,3 +57,77 @@ def test_symbol_allowlist():
     # Should fail
     with pytest.raises(RiskLimitExceededError):
         risk.check_symbol_allowed("DOGE")
+
+
+def test_validate_order():
+    """Test combined order validation applies every limit"""
+    limits = RiskLimits(max_position_size_usd=1000.0, max_leverage=10.0, allowed_symbols=["BTC"])
+    risk = RiskManager(limits)
+    
+    # Should pass
+    risk.validate_order("BTC", 500.0, 5.0, 0.0)
+    
+    # Should fail
+    for args in [("ETH", 500.0, 5.0, 0.0), ("BTC", 2000.0, 5.0, 0.0),
+                 ("BTC", 500.0, 5.0, 4800.0), ("BTC", 500.0, 20.0, 0.0)]:
+        with pytest.raises(RiskLimitExceededError):
+            risk.validate_order(*args)
+
+
+def test_tracked_notional_feeds_exposure_check():
+    """Test exposure defaults to the incrementally tracked notional"""
+    limits = RiskLimits(max_position_size_usd=1000.0)
+    risk = RiskManager(limits)
+    risk.update_position_notional("BTC", 0.05, 50000.0)
+    risk.update_position_notional("ETH", 1.0, 2200.0)
+    assert risk.total_notional == pytest.approx(4700.0)
+    
+    with pytest.raises(RiskLimitExceededError):
+        risk.check_position_size("SOL", 500.0)
+    
+    risk.update_position_notional("ETH", 0.0, 0.0)
+    risk.check_position_size("SOL", 500.0)
+
+
+def test_risk_limits_validation():
+    """Test out-of-range limits are rejected"""
+    with pytest.raises(ValueError):
+        RiskLimits(max_leverage=100.0)
+    
+    with pytest.raises(ValueError):
+        RiskLimits(max_position_size_usd=-1.0)
+    
+    assert RiskLimits(allowed_symbols=["BTC"]).allowed_symbols == frozenset({"BTC"})
+
+
+def test_check_all():
+    """Test combined risk check"""
+    manager = RiskManager(RiskLimits(max_position_size_usd=1000.0, max_daily_loss_usd=500.0))
+    
+    # Should pass
+    manager.check_all("BTC", 500.0, 5.0, potential_loss=-100.0)
+    
+    # Should fail - each limit reports its own message
+    with pytest.raises(RiskLimitExceededError, match="Position size"):
+        manager.check_all("BTC", 2000.0, 20.0)
+    with pytest.raises(RiskLimitExceededError, match="Leverage"):
+        manager.check_all("BTC", 500.0, 20.0)
+    with pytest.raises(RiskLimitExceededError, match="Daily loss"):
+        manager.check_all("BTC", 500.0, 5.0, potential_loss=-600.0)
+
+
+def test_check_batch():
+    """Test basket validation"""
+    manager = RiskManager(RiskLimits(max_position_size_usd=1000.0, allowed_symbols=["BTC", "ETH"]))
+    
+    # Should pass
+    manager.check_batch([("BTC", 1000.0, 5.0), ("ETH", 1000.0, 2.0)])
+    
+    # Should fail - oversized, disallowed and over-leveraged legs are all reported
+    with pytest.raises(RiskLimitExceededError, match=r"Orders \[1, 2, 3\]"):
+        manager.check_batch([
+            ("BTC", 500.0, 5.0),
+            ("ETH", 1500.0, 5.0),
+            ("SOL", 100.0, 5.0),
+            ("BTC", 100.0, 20.0),
+        ])
@@ -0,0 +1,55 @@
+"""Tests for utility functions"""
+
+import numpy as np
+import pytest
+from unju_perps import utils
+
+
+def test_private_key_from_env(monkeypatch):
+    """Test private key is prefixed and read once"""
+    monkeypatch.setattr(utils, "_PK_CACHE", {})
+    monkeypatch.setenv("TEST_PRIVATE_KEY", "ab" * 32)
+    
+    # Should pass - missing 0x prefix is added
+    assert utils.get_private_key_from_env("TEST_PRIVATE_KEY") == "0x" + "ab" * 32
+    
+    # Should pass - later changes to the environment are not picked up
+    monkeypatch.setenv("TEST_PRIVATE_KEY", "cd" * 32)
+    assert utils.get_private_key_from_env("TEST_PRIVATE_KEY") == "0x" + "ab" * 32
+
+
+def test_format_symbol():
+    """Test symbol normalization"""
+    # Should pass
+    assert utils.format_symbol("btc") == "BTC"
+    assert utils.format_symbol("BTCUSD") == "BTC"
+    assert utils.format_symbol("BTCUSDT") == "BTC"
+    assert utils.format_symbol("eth-usdt") == "ETH"
+
+
+def test_liquidation_price_batch():
+    """Test batch liquidation prices match the scalar version"""
+    entry = np.array([100.0, 100.0])
+    leverage = np.array([10.0, 5.0])
+    signs = np.array([1.0, -1.0])
+    
+    expected = [
+        utils.calculate_liquidation_price(100.0, 10.0, "long"),
+        utils.calculate_liquidation_price(100.0, 5.0, "short"),
+    ]
+    
+    # Should pass - long below entry, short above
+    assert expected[0] < 100.0 < expected[1]
+    assert utils.calculate_liquidation_price_batch(entry, leverage, signs).tolist() == pytest.approx(expected)
+
+
+def test_position_size_batch():
+    """Test batch position sizing matches the scalar version"""
+    notional = np.array([1000.0, 500.0])
+    entry = np.array([50000.0, 2500.0])
+    
+    # Should pass
+    assert utils.calculate_position_size_batch(notional, entry, 2.0).tolist() == pytest.approx([
+        utils.calculate_position_size(1000.0, 50000.0, 2.0),
+        utils.calculate_position_size(500.0, 2500.0, 2.0),
+    ])
@@ -0,0 +1,155 @@
+"""Tests for WalletManager"""
+
+import sys
+import threading
+import time
+
+import orjson
+from eth_account import Account
+from unju_perps.wallet import WalletManager
+
+
+def test_get_or_create_wallet():
+    """Test existing wallets are found by user ID or email"""
+    manager = WalletManager()
+    created = manager.create_wallet("alice@example.com", user_id="alice")
+    
+    # Should pass - same user or same email returns the existing wallet
+    assert manager.get_or_create_wallet("other@example.com", "alice")["address"] == created["address"]
+    assert manager.get_or_create_wallet("alice@example.com")["address"] == created["address"]
+    
+    # Should pass - a new user without an ID gets their own wallet
+    other = manager.get_or_create_wallet("bob@example.com")
+    assert other["address"] != created["address"]
+    assert len(manager.wallets) == 2
+
+
+def test_check_rent_due():
+    """Test rent falls due after a year"""
+    manager = WalletManager()
+    address = manager.create_wallet("alice@example.com")["address"]
+    
+    # Should pass - rent is not due on a new wallet
+    assert manager.check_rent_due(address) is False
+    
+    manager.wallets[address].next_rent_due_ts -= 366 * 24 * 3600
+    assert manager.check_rent_due(address) is True
+
+
+def test_due_wallets(monkeypatch):
+    """Test rent sweep across wallets"""
+    manager = WalletManager()
+    addresses = [manager.create_wallet(f"user{i}@example.com")["address"] for i in range(20)]
+    
+    # Should pass - nothing is due on new wallets
+    assert manager.due_wallets() == []
+    
+    # Should pass - a year later every wallet owes rent
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 366 * 24 * 3600)
+    assert manager.due_wallets() == addresses
+
+
+def test_wallet_info_timestamps():
+    """Test returned timestamps are UTC ISO 8601 strings"""
+    manager = WalletManager()
+    created = manager.create_wallet("alice@example.com")
+    info = manager.get_wallet_info(created["address"])
+    
+    # Should pass - every dict carries the same offset-aware format
+    assert created["next_rent_due"] == info["next_rent_due"]
+    assert info["created_at"].endswith("+00:00")
+    assert manager.charge_rent(created["address"])["next_rent_due"].endswith("+00:00")
+
+
+def test_env_wallet_info_copied(monkeypatch):
+    """Test the cached environment wallet can't be changed by callers"""
+    monkeypatch.setenv("HYPERLIQUID_ADDRESS", "0xabc")
+    manager = WalletManager()
+    
+    manager.get_wallet_info("0xabc")["active"] = False
+    
+    # Should pass - the next lookup still sees the cached values
+    assert manager.get_wallet_info("0xabc")["active"] is True
+
+
+def test_wallet_private_key():
+    """Test stored key signs as the wallet address"""
+    manager = WalletManager()
+    address = manager.create_wallet("alice@example.com", user_id="alice")["address"]
+    info = manager.get_or_create_wallet("alice@example.com", "alice")
+    
+    # Should pass - raw bytes are stored, hex is returned
+    assert isinstance(manager.wallets[address].private_key, bytes)
+    assert Account.from_key(info["private_key"]).address == address
+
+
+def test_wallet_json():
+    """Test wallet records serialize to JSON"""
+    manager = WalletManager()
+    address = manager.create_wallet("alice@example.com")["address"]
+    
+    data = orjson.loads(manager.wallet_json(address))
+    
+    # Should pass
+    assert data["address"] == address
+    assert "private_key" not in data
+    assert data["next_rent_due"].endswith("+00:00")
+
+
+def test_max_wallets(monkeypatch):
+    """Test bounded store evicts the least recently used wallet"""
+    manager = WalletManager(max_wallets=2)
+    first = manager.create_wallet("a@example.com", user_id="a")["address"]
+    second = manager.create_wallet("b@example.com")["address"]
+    manager.get_wallet_info(first)
+    third = manager.create_wallet("c@example.com")["address"]
+    
+    # Should pass - the untouched second wallet was evicted from every index
+    assert list(manager.wallets) == [first, third]
+    assert second not in manager.wallets
+    assert manager.get_wallet_info(second) == {}
+    assert "b@example.com" not in manager._by_email
+    
+    now = time.time()
+    monkeypatch.setattr(time, "time", lambda: now + 366 * 24 * 3600)
+    assert sorted(manager.due_wallets()) == sorted([first, third])
+
+
+def test_max_wallets_concurrent_lookups():
+    """Test lookups racing evictions on a bounded store"""
+    manager = WalletManager(max_wallets=4)
+    addresses = [manager.create_wallet(f"seed{i}@example.com")["address"] for i in range(4)]
+    errors = []
+    
+    def create() -> None:
+        try:
+            for i in range(200):
+                addresses.append(manager.create_wallet(f"new{i}@example.com")["address"])
+        except Exception as e:
+            errors.append(e)
+    
+    def lookup() -> None:
+        try:
+            for _ in range(500):
+                # The oldest survivor is the next one create() evicts
+                manager.get_wallet_info(addresses[-4])
+                manager.get_or_create_wallet("seed0@example.com")
+        except Exception as e:
+            errors.append(e)
+    
+    threads = [threading.Thread(target=create)] + [threading.Thread(target=lookup) for _ in range(4)]
+    # Switch threads as often as possible to widen the race window
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)
+    try:
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    finally:
+        sys.setswitchinterval(interval)
+    
+    # Should pass - no lookup saw a half-evicted wallet and the bound held
+    assert errors == []
+    assert len(manager.wallets) == 4
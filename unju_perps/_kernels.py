@@ -0,0 +1,109 @@
+"""Numeric kernels, compiled with Numba when it is installed"""
+
+from typing import Any, Callable, Tuple, TypeVar, cast
+
+import numpy as np
+
+try:
+    import numba
+    from numba import prange
+except ImportError:  # Numba is optional (pip install unju-perps[fast])
+    numba = None  # type: ignore[assignment]
+    prange = range  # type: ignore[assignment,misc]
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+def jit(**options: Any) -> Callable[[_F], _F]:
+    """
+    Compile a kernel with ``numba.njit(**options)``, or leave it as plain
+    Python/NumPy when Numba is not installed.
+    """
+    if numba is None:
+        return lambda func: func
+    return cast(Callable[[_F], _F], numba.njit(**options))
+
+
+@jit(cache=True, fastmath=True)
+def pnl_pct_vec(pnl: np.ndarray, size: np.ndarray, entry_price: np.ndarray) -> np.ndarray:
+    """Unrealized PnL as a percentage of entry notional, per position."""
+    pct: np.ndarray = pnl / (size * entry_price) * 100.0
+    return pct
+
+
+@jit(cache=True, parallel=True)
+def _ohlc(prices: np.ndarray, bounds: np.ndarray) -> np.ndarray:
+    """Open, high, low, close of prices[bounds[i]:bounds[i + 1]] for each bucket i."""
+    n = bounds.shape[0] - 1
+    out = np.full((n, 4), np.nan)
+    for b in prange(n):
+        lo = bounds[b]
+        hi = bounds[b + 1]
+        if lo == hi:
+            continue
+        high = prices[lo]
+        low = prices[lo]
+        for i in range(lo + 1, hi):
+            high = max(high, prices[i])
+            low = min(low, prices[i])
+        out[b, 0] = prices[lo]
+        out[b, 1] = high
+        out[b, 2] = low
+        out[b, 3] = prices[hi - 1]
+    return out
+
+
+def downsample_ohlc(
+    timestamps: np.ndarray, prices: np.ndarray, bucket_sec: int
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Downsample ticks into fixed-width OHLC candles.
+    
+    Args:
+        timestamps: Tick times in epoch seconds, ascending
+        prices: Tick prices, aligned with timestamps
+        bucket_sec: Candle width in seconds
+    
+    Returns:
+        (candle start times, array of open/high/low/close rows); candles
+        without ticks are NaN; both empty when there are no ticks
+    """
+    if len(timestamps) == 0:
+        return np.empty(0, dtype=np.float64), np.empty((0, 4), dtype=np.float64)
+    
+    first = timestamps[0] - timestamps[0] % bucket_sec
+    n = int((timestamps[-1] - first) // bucket_sec) + 1
+    edges = first + bucket_sec * np.arange(n + 1)
+    bounds = np.searchsorted(timestamps, edges)
+    return edges[:-1], _ohlc(np.ascontiguousarray(prices, dtype=np.float64), bounds)
+
+
+# Bits set in the result of risk_violations
+RISK_SIZE = 1
+RISK_EXPOSURE = 2
+RISK_LEVERAGE = 4
+RISK_DAILY_LOSS = 8
+
+
+@jit(cache=True)
+def risk_violations(
+    size_usd: float,
+    total_exposure: float,
+    leverage: float,
+    daily_pnl: float,
+    potential_loss: float,
+    max_size: float,
+    max_leverage: float,
+    max_daily_loss: float,
+) -> int:
+    """Bitmask of the RISK_* limits an order would break; 0 when it passes."""
+    mask = 0
+    if size_usd > max_size:
+        mask |= RISK_SIZE
+    if total_exposure > max_size * 5.0:
+        mask |= RISK_EXPOSURE
+    if leverage > max_leverage:
+        mask |= RISK_LEVERAGE
+    if daily_pnl + potential_loss < -max_daily_loss:
+        mask |= RISK_DAILY_LOSS
+    return mask
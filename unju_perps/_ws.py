@@ -0,0 +1,113 @@
+"""Market data websocket, on picows when it is installed"""
+
+from typing import Any, Callable, Dict, Optional, cast
+
+import orjson
+
+try:
+    import msgspec  # type: ignore[import-not-found]
+except ImportError:  # msgspec is optional (pip install unju-perps[ws])
+    msgspec = None  # type: ignore[assignment]
+
+try:
+    from picows import WSListener, WSMsgType, ws_connect  # type: ignore[import-not-found]
+except ImportError:  # picows is optional (pip install unju-perps[ws])
+    WSListener = object  # type: ignore[assignment,misc]
+    WSMsgType = None  # type: ignore[assignment,misc]
+    ws_connect = None  # type: ignore[assignment]
+
+MAINNET_WS_URL = "wss://api.hyperliquid.xyz/ws"
+TESTNET_WS_URL = "wss://api.hyperliquid-testnet.xyz/ws"
+
+# Hyperliquid drops connections idle for 60s, so ping well before that
+_PING_INTERVAL = 50.0
+
+_SUBSCRIBE_MIDS = orjson.dumps({"method": "subscribe", "subscription": {"type": "allMids"}})
+_PING = orjson.dumps({"method": "ping"})
+
+if msgspec is not None:
+    class _Envelope(msgspec.Struct):
+        """Channel name plus the still-encoded payload of a server message."""
+        channel: str
+        data: msgspec.Raw = msgspec.Raw()
+    
+    class _AllMids(msgspec.Struct):
+        """Payload of an allMids update."""
+        mids: Dict[str, str]
+    
+    # Decoding the envelope leaves data unparsed, so frames from other
+    # channels are never materialized; allMids payloads are decoded straight
+    # into their schema in a second pass over just those bytes.
+    _envelope_decoder = msgspec.json.Decoder(_Envelope)
+    _mids_decoder = msgspec.json.Decoder(_AllMids)
+
+
+def parse_mids(payload: bytes) -> Optional[Dict[str, str]]:
+    """
+    Extract mid prices from an allMids frame.
+    
+    Args:
+        payload: Raw websocket frame payload
+    
+    Returns:
+        Mapping of coin to mid price string, or None for any other message
+    """
+    if msgspec is not None:
+        envelope = _envelope_decoder.decode(payload)
+        if envelope.channel != "allMids":
+            return None
+        return cast(Dict[str, str], _mids_decoder.decode(envelope.data).mids)
+    
+    msg = orjson.loads(payload)
+    if msg.get("channel") != "allMids":
+        return None
+    return cast(Dict[str, str], msg["data"]["mids"])
+
+
+class _MidsListener(WSListener):
+    """Subscribes to allMids and hands every update to a callback."""
+    
+    def __init__(self, on_mids: Callable[[Dict[str, str]], None]) -> None:
+        self._on_mids = on_mids
+    
+    def on_ws_connected(self, transport: Any) -> None:
+        transport.send(WSMsgType.TEXT, _SUBSCRIBE_MIDS)
+    
+    def send_user_specific_ping(self, transport: Any) -> None:
+        transport.send(WSMsgType.TEXT, _PING)
+    
+    def is_user_specific_pong(self, frame: Any) -> bool:
+        return frame.msg_type == WSMsgType.TEXT and b'"pong"' in frame.get_payload_as_bytes()
+    
+    def on_ws_frame(self, transport: Any, frame: Any) -> None:
+        if frame.msg_type != WSMsgType.TEXT:
+            return
+        mids = parse_mids(frame.get_payload_as_bytes())
+        if mids is not None:
+            self._on_mids(mids)
+
+
+async def connect_mids(url: str, on_mids: Callable[[Dict[str, str]], None]) -> Any:
+    """
+    Open a websocket streaming allMids updates into on_mids.
+    
+    Args:
+        url: Hyperliquid websocket endpoint
+        on_mids: Called on the event loop with each coin -> mid mapping
+    
+    Returns:
+        picows transport; close it with disconnect()
+    
+    Raises:
+        ImportError: If picows is not installed
+    """
+    if ws_connect is None:
+        raise ImportError("picows is required for the market data feed: pip install unju-perps[ws]")
+    
+    transport, _ = await ws_connect(
+        lambda: _MidsListener(on_mids),
+        url,
+        enable_auto_ping=True,
+        auto_ping_idle_timeout=_PING_INTERVAL,
+    )
+    return transport
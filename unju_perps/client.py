@@ -1,9 +1,15 @@
 """
 Hyperliquid trading client
 """
-from typing import Optional, List
-from datetime import datetime, timedelta
+import asyncio
+import functools
+import threading
+import time
+from typing import Any, Callable, Optional, List, Dict, Tuple, TypeVar, Union, cast
+from datetime import datetime, timedelta, timezone
+import numpy as np
 from eth_account import Account
+from eth_account.signers.local import LocalAccount
 
 from .types import (
     Order,
@@ -16,6 +22,7 @@ from .types import (
     RiskLimits
 )
 from .risk import RiskManager
+from ._ws import MAINNET_WS_URL, TESTNET_WS_URL, connect_mids
 from .exceptions import (
     InsufficientBalanceError,
     InvalidSymbolError,
@@ -23,6 +30,61 @@ from .exceptions import (
     PositionNotFoundError
 )
 
+# Mock prices used until the Hyperliquid SDK is wired in
+_MOCK_PRICES: dict[str, float] = {
+    "BTC": 51234.56,
+    "ETH": 2345.67,
+    "SOL": 123.45,
+    "ARB": 1.23,
+    "AVAX": 45.67,
+}
+
+_SUPPORTED_SYMBOLS: frozenset[str] = frozenset(_MOCK_PRICES)
+
+# Row of each supported symbol in PerpTrader's per-symbol arrays
+_SYMBOL_IDX: dict[str, int] = {symbol: i for i, symbol in enumerate(_MOCK_PRICES)}
+
+# Accepted order side spellings; OrderSide members hash equal to their values
+_SIDE_MAP: dict[str, OrderSide] = {"long": OrderSide.LONG, "short": OrderSide.SHORT}
+
+MAINTENANCE_MARGIN = 0.005  # 0.5%
+
+# Relative size difference below which an order exactly closes a position
+_SIZE_TOLERANCE = 1e-9
+
+# How long (seconds) repeated reads may be served from cache
+_MARKET_TTL = 0.5
+_BALANCE_TTL = 0.1
+
+
+def _parse_side(side: Union[OrderSide, str]) -> OrderSide:
+    """Resolve an OrderSide or a case-insensitive "long"/"short" string."""
+    parsed = _SIDE_MAP.get(side)
+    if parsed is None:
+        parsed = _SIDE_MAP.get(side.lower()) if isinstance(side, str) else None
+        if parsed is None:
+            raise ValueError(f"Invalid side {side!r}: expected 'long' or 'short'")
+    return parsed
+
+
+@functools.lru_cache(maxsize=32)
+def _derive_account(private_key: str) -> LocalAccount:
+    """Derive (once per process) the account for a private key."""
+    account: LocalAccount = Account.from_key(private_key)
+    return account
+
+
+_F = TypeVar("_F", bound=Callable[..., Any])
+
+
+def _synchronized(method: _F) -> _F:
+    """Run a PerpTrader method while holding the instance lock."""
+    @functools.wraps(method)
+    def wrapper(self: "PerpTrader", *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            return method(self, *args, **kwargs)
+    return cast(_F, wrapper)
+
 
 class PerpTrader:
     """
@@ -34,7 +96,7 @@ class PerpTrader:
     
     def __init__(
         self,
-        private_key: str,
+        private_key: Optional[str] = None,
         testnet: bool = True,
         risk_limits: Optional[RiskLimits] = None
     ):
@@ -42,31 +104,90 @@ class PerpTrader:
         Initialize PerpTrader.
         
         Args:
-            private_key: Ethereum private key (0x prefixed hex)
+            private_key: Ethereum private key (0x prefixed hex); the account
+                is derived from it on first use
             testnet: Use Hyperliquid testnet (default: True)
             risk_limits: Risk management limits
         """
         self.testnet = testnet
-        self.account = Account.from_key(private_key)
-        self.address = self.account.address
+        self._private_key = private_key
+        self._account: Optional[LocalAccount] = None
         
         # Initialize risk manager
         self.risk_manager = RiskManager(risk_limits or RiskLimits())
         
-        # TODO: Initialize Hyperliquid SDK
+        # TODO: Initialize Hyperliquid SDK on first trade (like account), with
+        # the imports local so servers that never trade don't pay for them:
         # from hyperliquid.exchange import Exchange
         # from hyperliquid.info import Info
         # self.exchange = Exchange(wallet=self.account, testnet=testnet)
         # self.info = Info(testnet=testnet)
         
+        # Market data websocket opened by start_market_feed; mids land in _mark
+        self._ws_market = None
+        
         # For now, use mock data
         self._mock_balance = 10000.0
-        self._mock_positions: List[Position] = []
+        self._mock_positions: Dict[str, Position] = {}  # one position per symbol
+        
+        # Portfolio as aligned arrays with one row per symbol (see _SYMBOL_IDX),
+        # so PnL, margin and exposure are whole-array expressions. Rows
+        # without an open position have zero size, margin and notional.
+        n = len(_SYMBOL_IDX)
+        self._mark = np.fromiter(_MOCK_PRICES.values(), dtype=np.float64, count=n)
+        self._entry = np.zeros(n)
+        self._size = np.zeros(n)
+        self._sign = np.zeros(n)
+        self._margin = np.zeros(n)
+        
+        # Serializes state changes when orders are fanned out across threads
+        self._lock = threading.RLock()
+        
+        # Short-lived read caches of (monotonic time, value), invalidated on trades
+        self._market_cache: dict[str, Tuple[float, Market]] = {}
+        self._balance_cache: Optional[Tuple[float, Balance]] = None
+    
+    @property
+    def account(self) -> Optional[LocalAccount]:
+        """Signing account, derived from the private key on first access."""
+        if self._account is None and self._private_key is not None:
+            self._account = _derive_account(self._private_key)
+        return self._account
+    
+    @property
+    def address(self) -> Optional[str]:
+        """Wallet address, or None when no private key is configured."""
+        account = self.account
+        return account.address if account is not None else None
+    
+    @property
+    def risk_limits(self) -> RiskLimits:
+        """Active risk limits."""
+        return self.risk_manager.limits
     
+    async def aclose(self) -> None:
+        """Close exchange connections."""
+        if self._ws_market is not None:
+            self._ws_market.disconnect()
+            await self._ws_market.wait_disconnected()
+            self._ws_market = None
+    
+    async def start_market_feed(self) -> None:
+        """
+        Stream live mid prices from the exchange into the portfolio.
+        
+        Raises:
+            ImportError: If picows is not installed (pip install unju-perps[ws])
+        """
+        if self._ws_market is None:
+            url = TESTNET_WS_URL if self.testnet else MAINNET_WS_URL
+            self._ws_market = await connect_mids(url, self._apply_mids)
+    
+    @_synchronized
     def market_order(
         self,
         symbol: str,
-        side: OrderSide,
+        side: Union[OrderSide, str],
         size_usd: float,
         slippage_bps: int = 50,
         stop_loss_pct: Optional[float] = None,
@@ -75,9 +196,12 @@ class PerpTrader:
         """
         Place a market order.
         
+        An order on the other side of an open position reduces it, closes
+        it, or closes it and opens the remainder on the new side.
+        
         Args:
             symbol: Asset symbol (e.g., "BTC", "ETH")
-            side: Order side (long or short)
+            side: Order side (OrderSide or "long"/"short")
             size_usd: Position size in USD
             slippage_bps: Max slippage in basis points
             stop_loss_pct: Optional stop loss percentage
@@ -87,68 +211,163 @@ class PerpTrader:
             Order object with execution details
         
         Raises:
+            ValueError: Side is not long or short
             InvalidSymbolError: Symbol not supported
             InsufficientBalanceError: Not enough balance
             RiskLimitExceededError: Would exceed risk limits
             OrderRejectedError: Exchange rejected the order
         """
-        # Validate symbol
-        symbol = symbol.upper()
-        if symbol not in ["BTC", "ETH", "SOL", "ARB", "AVAX"]:
-            raise InvalidSymbolError(f"Symbol {symbol} not supported")
+        # Validate symbol (already-uppercase input skips the upper() copy)
+        if symbol not in _SUPPORTED_SYMBOLS:
+            symbol = symbol.upper()
+            if symbol not in _SUPPORTED_SYMBOLS:
+                raise InvalidSymbolError(f"Symbol {symbol} not supported")
+        
+        side = _parse_side(side)
+        mock_price = self._get_mock_price(symbol)
+        order_size = size_usd / mock_price
+        
+        # As on Hyperliquid, an order against the open position reduces it
+        # first; only what is left after closing it opens the other side
+        existing = self._mock_positions.get(symbol)
+        reduce_size = 0.0
+        if existing is not None and existing.side is not side:
+            reduce_size = existing.size
+            if order_size < existing.size * (1.0 - _SIZE_TOLERANCE):
+                reduce_size = order_size
+        open_size = order_size - reduce_size
+        if open_size < order_size * _SIZE_TOLERANCE:
+            open_size = 0.0  # rounding left over from closing the position
+        open_usd = open_size * mock_price
         
         # Check balance
-        required_margin = size_usd / 10  # Assuming 10x leverage
+        required_margin = open_usd / 10  # Assuming 10x leverage
         if required_margin > self._mock_balance:
             raise InsufficientBalanceError(
                 f"Insufficient balance. Required: ${required_margin:.2f}, Available: ${self._mock_balance:.2f}"
             )
         
-        # Check risk limits
-        self.risk_manager.check_position_size(symbol, size_usd, self._mock_positions)
-        self.risk_manager.check_leverage(10.0)
-        self.risk_manager.check_symbol_allowed(symbol)
+        # Check risk limits (reducing a position only lowers exposure)
+        if open_usd > 0:
+            self.risk_manager.validate_order(symbol, open_usd, 10.0)
         
-        # TODO: Place order via Hyperliquid SDK
+        # TODO: Place order via Hyperliquid SDK (single orders could go out as
+        # "post" messages on an authenticated websocket instead of REST)
         # result = self.exchange.market_order(...)
         
         # Mock order response
-        mock_price = self._get_mock_price(symbol)
+        now_ns = time.time_ns()
+        now = datetime.fromtimestamp(now_ns / 1e9, tz=timezone.utc)
         order = Order(
-            id=f"order_{datetime.utcnow().timestamp()}",
+            id=f"order_{now_ns}",
             symbol=symbol,
             side=side,
             type=OrderType.MARKET,
-            size=size_usd / mock_price,
-            filled_size=size_usd / mock_price,
+            size=order_size,
+            filled_size=order_size,
             average_price=mock_price,
             status=OrderStatus.FILLED,
-            timestamp=datetime.utcnow(),
+            timestamp=now,
             fees=size_usd * 0.0005  # 0.05% fee
         )
         
+        position = existing
+        if existing is not None and reduce_size:
+            # Realize PnL on the reduced part and release its share of margin
+            pnl = existing.side_sign * (mock_price - existing.entry_price) * reduce_size
+            released = existing.margin * reduce_size / existing.size
+            self._mock_balance += released + pnl - reduce_size * mock_price * 0.0005
+            
+            if reduce_size < existing.size:
+                existing.size -= reduce_size
+                existing.margin -= released
+                existing.realized_pnl += pnl
+            else:
+                del self._mock_positions[symbol]
+                position = None
+        
         # Update mock balance
         self._mock_balance -= required_margin
         
-        # Create position
-        position = Position(
-            symbol=symbol,
-            side=side,
-            size=order.filled_size,
-            entry_price=order.average_price,
-            mark_price=mock_price,
-            liquidation_price=self._calculate_liquidation_price(
-                mock_price, 10.0, side.value
-            ),
-            leverage=10.0,
-            unrealized_pnl=0.0,
-            margin=required_margin,
-            timestamp=datetime.utcnow()
-        )
-        self._mock_positions.append(position)
+        if position is None and open_usd > 0:
+            # Create position (or the flipped remainder of a closed one)
+            position = Position(
+                symbol=symbol,
+                side=side,
+                size=open_size,
+                entry_price=mock_price,
+                mark_price=mock_price,
+                liquidation_price=self._calculate_liquidation_price(
+                    mock_price, 10.0, side
+                ),
+                leverage=10.0,
+                unrealized_pnl=0.0,
+                margin=required_margin,
+                timestamp=now
+            )
+            self._mock_positions[symbol] = position
+        elif position is not None and not reduce_size:
+            # Add to position at the size-weighted average entry
+            size = position.size + open_size
+            position.entry_price = (
+                position.entry_price * position.size + mock_price * open_size
+            ) / size
+            position.size = size
+            position.margin += required_margin
+            position.liquidation_price = self._calculate_liquidation_price(
+                position.entry_price, position.leverage, side
+            )
+        
+        i = _SYMBOL_IDX[symbol]
+        if position is None:
+            self._entry[i] = self._size[i] = self._sign[i] = self._margin[i] = 0.0
+            self.risk_manager.update_position_notional(symbol, 0.0, 0.0)
+        else:
+            self._entry[i] = position.entry_price
+            self._size[i] = position.size
+            self._sign[i] = position.side_sign
+            self._margin[i] = position.margin
+            self.risk_manager.update_position_notional(symbol, position.size, mock_price)
+        self._invalidate_caches(symbol)
         
         return order
     
+    async def market_order_async(
+        self,
+        symbol: str,
+        side: Union[OrderSide, str],
+        size_usd: float,
+        slippage_bps: int = 50,
+        stop_loss_pct: Optional[float] = None,
+        take_profit_pct: Optional[float] = None
+    ) -> Order:
+        """
+        Place a market order without blocking the event loop.
+        
+        Runs market_order on a worker thread. Each call is submitted
+        immediately; concurrent calls take the trader lock in turn, so
+        every order is filled on its own.
+        
+        Args:
+            Same as market_order
+        
+        Returns:
+            Filled order
+        
+        Raises:
+            Same as market_order
+        """
+        return await asyncio.to_thread(
+            self.market_order,
+            symbol,
+            side,
+            size_usd,
+            slippage_bps,
+            stop_loss_pct,
+            take_profit_pct,
+        )
+    
+    @_synchronized
     def close_position(
         self,
         symbol: str,
@@ -174,11 +393,12 @@ class PerpTrader:
         # TODO: Close position via Hyperliquid SDK
         
         # Mock close order
+        now_ns = time.time_ns()
         mock_price = self._get_mock_price(symbol)
-        close_side = OrderSide.SHORT if position.side == OrderSide.LONG else OrderSide.LONG
+        close_side = OrderSide.SHORT if position.side is OrderSide.LONG else OrderSide.LONG
         
         order = Order(
-            id=f"order_{datetime.utcnow().timestamp()}",
+            id=f"order_{now_ns}",
             symbol=symbol,
             side=close_side,
             type=OrderType.MARKET,
@@ -186,74 +406,76 @@ class PerpTrader:
             filled_size=position.size,
             average_price=mock_price,
             status=OrderStatus.FILLED,
-            timestamp=datetime.utcnow(),
+            timestamp=datetime.fromtimestamp(now_ns / 1e9, tz=timezone.utc),
             fees=position.size * mock_price * 0.0005
         )
         
         # Calculate PnL
-        if position.side == OrderSide.LONG:
-            pnl = (mock_price - position.entry_price) * position.size
-        else:
-            pnl = (position.entry_price - mock_price) * position.size
+        pnl = position.side_sign * (mock_price - position.entry_price) * position.size
         
         # Update mock balance
         self._mock_balance += position.margin + pnl - order.fees
         
         # Remove position
-        self._mock_positions = [p for p in self._mock_positions if p.symbol != symbol]
+        del self._mock_positions[symbol]
+        i = _SYMBOL_IDX[symbol]
+        self._entry[i] = self._size[i] = self._sign[i] = self._margin[i] = 0.0
+        self.risk_manager.update_position_notional(symbol, 0.0, 0.0)
+        self._invalidate_caches(symbol)
         
         return order
     
+    @_synchronized
     def get_position(self, symbol: str) -> Optional[Position]:
         """Get current position for a symbol."""
-        for position in self._mock_positions:
-            if position.symbol == symbol:
-                # Update mark price and PnL
-                mock_price = self._get_mock_price(symbol)
-                position.mark_price = mock_price
-                
-                if position.side == OrderSide.LONG:
-                    position.unrealized_pnl = (mock_price - position.entry_price) * position.size
-                else:
-                    position.unrealized_pnl = (position.entry_price - mock_price) * position.size
-                
-                return position
-        
-        return None
+        position = self._mock_positions.get(symbol)
+        if position is None:
+            return None
+        
+        # Update mark price and PnL
+        mock_price = self._get_mock_price(symbol)
+        position.mark_price = mock_price
+        position.unrealized_pnl = position.side_sign * (mock_price - position.entry_price) * position.size
+        self.risk_manager.update_position_notional(symbol, position.size, mock_price)
+        
+        return position
     
+    @_synchronized
     def get_all_positions(self) -> List[Position]:
         """Get all open positions."""
-        # Update all positions with current prices
-        for position in self._mock_positions:
-            mock_price = self._get_mock_price(position.symbol)
-            position.mark_price = mock_price
-            
-            if position.side == OrderSide.LONG:
-                position.unrealized_pnl = (mock_price - position.entry_price) * position.size
-            else:
-                position.unrealized_pnl = (position.entry_price - mock_price) * position.size
-        
-        return self._mock_positions
+        self._refresh_positions()
+        return list(self._mock_positions.values())
     
+    @_synchronized
     def get_balance(self) -> Balance:
         """Get account balance."""
-        positions = self.get_all_positions()
-        unrealized_pnl = sum(p.unrealized_pnl for p in positions)
-        margin_used = sum(p.margin for p in positions)
+        now = time.monotonic()
+        if self._balance_cache is not None and now - self._balance_cache[0] < _BALANCE_TTL:
+            return self._balance_cache[1]
         
-        return Balance(
+        unrealized_pnl = float(self._refresh_positions().sum())
+        margin_used = float(self._margin.sum())
+        
+        balance = Balance(
             total=self._mock_balance + margin_used + unrealized_pnl,
             available=self._mock_balance,
             margin_used=margin_used,
             unrealized_pnl=unrealized_pnl,
-            timestamp=datetime.utcnow()
+            timestamp=datetime.now(timezone.utc)
         )
+        self._balance_cache = (now, balance)
+        return balance
     
     def get_market_data(self, symbol: str) -> Market:
         """Get current market data for a symbol."""
+        now = time.monotonic()
+        ts, cached = self._market_cache.get(symbol, (0.0, None))
+        if cached is not None and now - ts < _MARKET_TTL:
+            return cached
+        
         mock_price = self._get_mock_price(symbol)
         
-        return Market(
+        market = Market(
             symbol=symbol,
             mark_price=mock_price,
             index_price=mock_price * 0.9999,
@@ -263,62 +485,83 @@ class PerpTrader:
             high_24h=mock_price * 1.02,
             low_24h=mock_price * 0.98,
             change_24h=1.5,
-            timestamp=datetime.utcnow()
+            timestamp=datetime.now(timezone.utc)
         )
+        self._market_cache[symbol] = (now, market)
+        return market
     
     def get_price_history(self, symbol: str, hours: int = 4) -> List[dict]:
         """Get price history for charting."""
         mock_price = self._get_mock_price(symbol)
-        history = []
-        
-        for i in range(hours * 12):  # 5-minute intervals
-            time = datetime.utcnow() - timedelta(minutes=(hours * 60) - (i * 5))
-            # Add some random variance
-            variance = (i % 10 - 5) * mock_price * 0.001
-            history.append({
-                "time": time.strftime("%H:%M"),
-                "price": mock_price + variance
-            })
-        
-        return history
+        n = hours * 12  # 5-minute intervals
+        start = datetime.now(timezone.utc) - timedelta(hours=hours)
+        step = timedelta(minutes=5)
+        
+        # Add some random variance
+        # TODO: Build candles from exchange trades with _kernels.downsample_ohlc
+        prices = mock_price + (np.arange(n) % 10 - 5) * mock_price * 0.001
+        
+        return [
+            {"time": (start + step * i).strftime("%H:%M"), "price": price}
+            for i, price in enumerate(prices.tolist())
+        ]
     
     def get_balance_history(self, days: int = 7) -> List[dict]:
         """Get balance history for charting."""
         current_balance = self.get_balance().total
-        history = []
-        
-        for i in range(days):
-            date = datetime.utcnow() - timedelta(days=days - i - 1)
-            # Simulate some growth
-            balance = current_balance * (1 - (days - i) * 0.01)
-            history.append({
-                "time": date.strftime("%Y-%m-%d"),
-                "balance": balance
-            })
-        
-        return history
+        start = datetime.now(timezone.utc) - timedelta(days=days - 1)
+        step = timedelta(days=1)
+        
+        # Simulate some growth
+        balances = current_balance * (1 - (days - np.arange(days)) * 0.01)
+        
+        return [
+            {"time": (start + step * i).strftime("%Y-%m-%d"), "balance": balance}
+            for i, balance in enumerate(balances.tolist())
+        ]
+    
+    def _invalidate_caches(self, symbol: str) -> None:
+        """Drop cached reads affected by a trade in symbol."""
+        self._market_cache.pop(symbol, None)
+        self._balance_cache = None
+    
+    @_synchronized
+    def _apply_mids(self, mids: Dict[str, str]) -> None:
+        """Write exchange mid prices for supported symbols into the mark array."""
+        for symbol, i in _SYMBOL_IDX.items():
+            px = mids.get(symbol)
+            if px is not None:
+                self._mark[i] = float(px)
+        
+        self._market_cache.clear()
+        self._balance_cache = None
+    
+    def _refresh_positions(self) -> np.ndarray:
+        """Update mark price and PnL of every position; returns the per-symbol PnL array."""
+        pnls = self._sign * (self._mark - self._entry) * self._size
+        
+        if self._mock_positions:
+            marks = self._mark.tolist()
+            pnl_list = pnls.tolist()
+            for symbol, position in self._mock_positions.items():
+                i = _SYMBOL_IDX[symbol]
+                position.mark_price = marks[i]
+                position.unrealized_pnl = pnl_list[i]
+                self.risk_manager.update_position_notional(symbol, position.size, marks[i])
+        
+        return pnls
     
     def _get_mock_price(self, symbol: str) -> float:
         """Get mock price for symbol."""
-        prices = {
-            "BTC": 51234.56,
-            "ETH": 2345.67,
-            "SOL": 123.45,
-            "ARB": 1.23,
-            "AVAX": 45.67
-        }
-        return prices.get(symbol, 100.0)
+        i = _SYMBOL_IDX.get(symbol)
+        return float(self._mark[i]) if i is not None else 100.0
     
     def _calculate_liquidation_price(
         self,
         entry_price: float,
         leverage: float,
-        side: str
+        side: OrderSide
     ) -> float:
-        """Calculate liquidation price."""
-        maintenance_margin = 0.005  # 0.5%
-        
-        if side == "long":
-            return entry_price * (1 - (1 / leverage) + maintenance_margin)
-        else:
-            return entry_price * (1 + (1 / leverage) - maintenance_margin)
+        """Calculate liquidation price (below entry for longs, above for shorts)."""
+        sign = 1.0 if side is OrderSide.SHORT else -1.0
+        return entry_price * (1.0 + sign * (1.0 / leverage - MAINTENANCE_MARGIN))
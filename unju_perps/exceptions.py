@@ -3,34 +3,34 @@
 
 class UnjuPerpsError(Exception):
     """Base exception for unju-perps"""
-    pass
+    __slots__ = ()
 
 
 class InsufficientBalanceError(UnjuPerpsError):
     """Raised when account has insufficient balance"""
-    pass
+    __slots__ = ()
 
 
 class InvalidSymbolError(UnjuPerpsError):
     """Raised when symbol is not supported"""
-    pass
+    __slots__ = ()
 
 
 class OrderRejectedError(UnjuPerpsError):
     """Raised when order is rejected by exchange"""
-    pass
+    __slots__ = ()
 
 
 class RiskLimitExceededError(UnjuPerpsError):
     """Raised when action would exceed risk limits"""
-    pass
+    __slots__ = ()
 
 
 class PositionNotFoundError(UnjuPerpsError):
     """Raised when position doesn't exist"""
-    pass
+    __slots__ = ()
 
 
 class ConnectionError(UnjuPerpsError):
     """Raised when connection to exchange fails"""
-    pass
+    __slots__ = ()
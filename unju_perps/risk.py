@@ -1,7 +1,10 @@
 """Risk management utilities"""
 
-from typing import Optional
-from unju_perps.types import Position, RiskLimits
+import threading
+from typing import Optional, Sequence, Tuple
+
+import numpy as np
+from unju_perps.types import RiskLimits
 from unju_perps.exceptions import RiskLimitExceededError
 
 
@@ -11,11 +14,208 @@ class RiskManager:
     def __init__(self, limits: RiskLimits):
         self.limits = limits
         self.daily_pnl = 0.0  # Track daily P&L
+        
+        # Open notional (size * mark price) per symbol and its running total,
+        # maintained by the client so exposure checks never walk positions
+        self._notional_by_symbol: dict[str, float] = {}
+        self._total_notional = 0.0
+        self._notional_lock = threading.Lock()
+    
+    @property
+    def total_notional(self) -> float:
+        """Notional USD currently open across all positions."""
+        return self._total_notional
+    
+    def update_position_notional(self, symbol: str, size: float, mark_price: float) -> None:
+        """
+        Record the current size and mark price of a position.
+        
+        Call when a position is opened, resized, re-marked or closed
+        (size 0). Safe to call from several threads.
+        """
+        notional = size * mark_price
+        with self._notional_lock:
+            previous = self._notional_by_symbol.pop(symbol, 0.0)
+            if notional:
+                self._notional_by_symbol[symbol] = notional
+            self._total_notional += notional - previous
+    
+    def validate_order(
+        self,
+        symbol: str,
+        size_usd: float,
+        leverage: float,
+        current_exposure: Optional[float] = None
+    ) -> None:
+        """
+        Run the symbol, position size and leverage checks in one call.
+        
+        Equivalent to check_symbol_allowed, check_position_size and
+        check_leverage, cheapest check first.
+        
+        Args:
+            symbol: Asset symbol
+            size_usd: Size of the new order in USD
+            leverage: Leverage of the new order
+            current_exposure: Open notional USD (default: tracked total)
+        
+        Raises:
+            RiskLimitExceededError: Any limit would be exceeded
+        """
+        limits = self.limits
+        allowed = limits.allowed_symbols
+        if allowed and symbol not in allowed:
+            raise RiskLimitExceededError(
+                f"Symbol {symbol} not in allowed list: {sorted(allowed)}"
+            )
+        
+        max_size = limits.max_position_size_usd
+        if size_usd > max_size:
+            raise RiskLimitExceededError(
+                f"Position size ${size_usd:.2f} exceeds max ${max_size:.2f}"
+            )
+        
+        if current_exposure is None:
+            current_exposure = self._total_notional
+        total_exposure = current_exposure + size_usd
+        max_total_exposure = max_size * 5  # 5x single position limit
+        if total_exposure > max_total_exposure:
+            raise RiskLimitExceededError(
+                f"Total exposure ${total_exposure:.2f} exceeds max ${max_total_exposure:.2f}"
+            )
+        
+        if leverage > limits.max_leverage:
+            raise RiskLimitExceededError(
+                f"Leverage {leverage}x exceeds max {limits.max_leverage}x"
+            )
+    
+    def check_all(
+        self,
+        symbol: str,
+        size_usd: float,
+        leverage: float,
+        potential_loss: float = 0.0,
+        current_exposure: Optional[float] = None
+    ) -> None:
+        """
+        Run every risk check on an order at once.
+        
+        The numeric limits are evaluated together by a compiled kernel;
+        error messages are only built when something fails, in the same
+        order as validate_order with the daily loss check last.
+        
+        Args:
+            symbol: Asset symbol
+            size_usd: Size of the new order in USD
+            leverage: Leverage of the new order
+            potential_loss: Worst-case loss of the order in USD (negative)
+            current_exposure: Open notional USD (default: tracked total)
+        
+        Raises:
+            RiskLimitExceededError: Any limit would be exceeded
+        """
+        # Deferred so importing the risk module does not pull in numba
+        from unju_perps._kernels import (
+            RISK_EXPOSURE,
+            RISK_LEVERAGE,
+            RISK_SIZE,
+            risk_violations,
+        )
+        
+        limits = self.limits
+        allowed = limits.allowed_symbols
+        if allowed and symbol not in allowed:
+            raise RiskLimitExceededError(
+                f"Symbol {symbol} not in allowed list: {sorted(allowed)}"
+            )
+        
+        if current_exposure is None:
+            current_exposure = self._total_notional
+        total_exposure = current_exposure + size_usd
+        mask = risk_violations(
+            size_usd,
+            total_exposure,
+            leverage,
+            self.daily_pnl,
+            potential_loss,
+            limits.max_position_size_usd,
+            limits.max_leverage,
+            limits.max_daily_loss_usd,
+        )
+        if not mask:
+            return
+        
+        if mask & RISK_SIZE:
+            self.check_position_size(symbol, size_usd, current_exposure)
+        if mask & RISK_EXPOSURE:
+            raise RiskLimitExceededError(
+                f"Total exposure ${total_exposure:.2f} exceeds max ${limits.max_position_size_usd * 5:.2f}"
+            )
+        if mask & RISK_LEVERAGE:
+            self.check_leverage(leverage)
+        self.check_daily_loss(potential_loss)
+    
+    def check_batch(
+        self,
+        orders: Sequence[Tuple[str, float, float]],
+        current_exposure: Optional[float] = None
+    ) -> None:
+        """
+        Validate a basket of orders at once.
+        
+        Applies the validate_order limits to every order, with exposure
+        accumulating across the basket in order.
+        
+        Args:
+            orders: (symbol, size_usd, leverage) per order
+            current_exposure: Open notional USD (default: tracked total)
+        
+        Raises:
+            RiskLimitExceededError: Any order would exceed a limit; the
+                message lists the indices of every failing order
+        """
+        if not orders:
+            return
+        
+        limits = self.limits
+        symbols, sizes, leverages = zip(*orders)
+        size_arr = np.array(sizes, dtype=np.float64)
+        lev_arr = np.array(leverages, dtype=np.float64)
+        
+        if current_exposure is None:
+            current_exposure = self._total_notional
+        max_size = limits.max_position_size_usd
+        failed = (
+            (size_arr > max_size)
+            | (current_exposure + np.cumsum(size_arr) > max_size * 5)
+            | (lev_arr > limits.max_leverage)
+        )
+        
+        allowed = limits.allowed_symbols
+        if allowed:
+            failed |= np.fromiter(
+                (symbol not in allowed for symbol in symbols), dtype=bool, count=len(symbols)
+            )
+        
+        if failed.any():
+            raise RiskLimitExceededError(
+                f"Orders {np.flatnonzero(failed).tolist()} exceed risk limits"
+            )
     
-    def check_position_size(self, symbol: str, size_usd: float, current_positions: list[Position]) -> None:
+    def check_position_size(
+        self,
+        symbol: str,
+        size_usd: float,
+        current_exposure: Optional[float] = None
+    ) -> None:
         """
         Verify new position wouldn't exceed size limits.
         
+        Args:
+            symbol: Asset symbol
+            size_usd: Size of the new order in USD
+            current_exposure: Open notional USD (default: tracked total)
+        
         Raises:
             RiskLimitExceededError: Position size exceeds limit
         """
@@ -25,7 +225,9 @@ class RiskManager:
             )
         
         # Check total exposure across all positions
-        total_exposure = sum(p.size * p.mark_price for p in current_positions) + size_usd
+        if current_exposure is None:
+            current_exposure = self._total_notional
+        total_exposure = current_exposure + size_usd
         max_total_exposure = self.limits.max_position_size_usd * 5  # 5x single position limit
         
         if total_exposure > max_total_exposure:
@@ -66,7 +268,7 @@ class RiskManager:
         """
         if self.limits.allowed_symbols and symbol not in self.limits.allowed_symbols:
             raise RiskLimitExceededError(
-                f"Symbol {symbol} not in allowed list: {self.limits.allowed_symbols}"
+                f"Symbol {symbol} not in allowed list: {sorted(self.limits.allowed_symbols)}"
             )
     
     def update_daily_pnl(self, pnl: float) -> None:
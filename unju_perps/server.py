@@ -7,17 +7,23 @@ Uses Magic server wallets and unju credits system.
 """
 import os
 import sys
-import json
 import asyncio
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from importlib import resources
 from typing import Optional, Any
 from datetime import datetime
 
+import numpy as np
+import orjson
 from mcp.server.fastmcp import FastMCP
 from mcp import types
 
+from ._kernels import pnl_pct_vec
 from .client import PerpTrader
 from .wallet import WalletManager
-from .types import OrderSide
 from .exceptions import (
     InsufficientBalanceError,
     InvalidSymbolError,
@@ -34,6 +40,9 @@ VIEW_WALLET = "ui://perps/wallet-setup"
 TESTNET = os.getenv("HYPERLIQUID_TESTNET", "true").lower() == "true"
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", "3001"))
+PRIVATE_KEY = os.getenv("HYPERLIQUID_PRIVATE_KEY")
+# Comma-separated browser origins allowed to call the HTTP server
+CORS_ORIGINS = [o.strip() for o in os.getenv("CORS_ORIGINS", "*").split(",") if o.strip()]
 
 # Initialize FastMCP
 mcp = FastMCP("unju-perps", stateless_http=True)
@@ -42,6 +51,50 @@ mcp = FastMCP("unju-perps", stateless_http=True)
 wallet_manager = WalletManager()
 
 
+# NumPy arrays/scalars and datetimes are encoded natively; naive datetimes
+# are treated as UTC
+_JSON_OPTIONS = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NAIVE_UTC
+
+
+def _dumps(obj: Any) -> str:
+    """Serialize a tool response to JSON text."""
+    return orjson.dumps(obj, option=_JSON_OPTIONS).decode()
+
+
+# Traders keyed by a hash of their private key, so the account, SDK clients
+# and risk state are built once per wallet rather than once per tool call
+_traders: dict[str, PerpTrader] = {}
+_traders_lock = threading.Lock()
+
+
+def reload_keys() -> None:
+    """Re-read HYPERLIQUID_PRIVATE_KEY from the environment (key rotation)."""
+    global PRIVATE_KEY
+    PRIVATE_KEY = os.getenv("HYPERLIQUID_PRIVATE_KEY")
+
+
+def _trader_entry(user_id: Optional[str] = None) -> tuple[str, PerpTrader]:
+    """Cache key and cached trader for user; see get_trader."""
+    # Try to get wallet from Magic or env var
+    private_key = PRIVATE_KEY
+    
+    if not private_key:
+        # User needs to create/connect wallet first
+        raise Exception("No wallet configured. Please run wallet_setup first.")
+    
+    key = hashlib.sha256(private_key.encode()).hexdigest()
+    trader = _traders.get(key)
+    if trader is None:
+        with _traders_lock:
+            trader = _traders.get(key)
+            if trader is None:
+                trader = _traders[key] = PerpTrader(
+                    private_key=private_key,
+                    testnet=TESTNET
+                )
+    return key, trader
+
+
 def get_trader(user_id: Optional[str] = None) -> PerpTrader:
     """
     Get or create trader instance for user.
@@ -49,17 +102,35 @@ def get_trader(user_id: Optional[str] = None) -> PerpTrader:
     In production, user_id comes from MCP host authentication.
     For now, we use a default user or HYPERLIQUID_PRIVATE_KEY env var.
     """
-    # Try to get wallet from Magic or env var
-    private_key = os.getenv("HYPERLIQUID_PRIVATE_KEY")
+    return _trader_entry(user_id)[1]
+
+
+# Dashboard balance history per trader cache key, stored pre-encoded as
+# (UTC day, monotonic time built, JSON fragment) and rebuilt at most once a
+# minute; the least recently used entry is dropped past _HISTORY_CACHE_SIZE
+_HISTORY_TTL = 60.0
+_HISTORY_CACHE_SIZE = 256
+_history_cache: OrderedDict[str, tuple[int, float, orjson.Fragment]] = OrderedDict()
+_history_lock = threading.Lock()
+
+
+def _balance_history_json(key: str, trader: PerpTrader, days: int = 7) -> orjson.Fragment:
+    """Balance history as JSON that _dumps embeds without re-encoding."""
+    day = int(time.time() // 86400)
+    now = time.monotonic()
+    with _history_lock:
+        cached = _history_cache.get(key)
+        if cached is not None and cached[0] == day and now - cached[1] < _HISTORY_TTL:
+            _history_cache.move_to_end(key)
+            return cached[2]
     
-    if not private_key:
-        # User needs to create/connect wallet first
-        raise Exception("No wallet configured. Please run wallet_setup first.")
-    
-    return PerpTrader(
-        private_key=private_key,
-        testnet=TESTNET
-    )
+    fragment = orjson.Fragment(orjson.dumps(trader.get_balance_history(days=days)))
+    with _history_lock:
+        _history_cache[key] = (day, now, fragment)
+        _history_cache.move_to_end(key)
+        if len(_history_cache) > _HISTORY_CACHE_SIZE:
+            _history_cache.popitem(last=False)
+    return fragment
 
 
 # ============================================================================
@@ -67,7 +138,7 @@ def get_trader(user_id: Optional[str] = None) -> PerpTrader:
 # ============================================================================
 
 @mcp.tool(meta={"ui": {"resourceUri": VIEW_WALLET}})
-def wallet_setup(
+async def wallet_setup(
     action: str = "info",
     email: Optional[str] = None
 ) -> list[types.TextContent]:
@@ -84,7 +155,7 @@ def wallet_setup(
         if not email:
             return [types.TextContent(
                 type="text",
-                text=json.dumps({
+                text=_dumps({
                     "error": "Email required for wallet creation",
                     "action": "create",
                     "cost": "1 unju-credit + 10 credits/year rent"
@@ -92,11 +163,11 @@ def wallet_setup(
             )]
         
         # Create Magic wallet and charge 1 credit
-        result = wallet_manager.create_wallet(email)
+        result = await asyncio.to_thread(wallet_manager.create_wallet, email)
         
         return [types.TextContent(
             type="text",
-            text=json.dumps({
+            text=_dumps({
                 "action": "created",
                 "address": result["address"],
                 "email": email,
@@ -115,7 +186,7 @@ def wallet_setup(
         
         return [types.TextContent(
             type="text",
-            text=json.dumps({
+            text=_dumps({
                 "action": "fund",
                 "address": address,
                 "network": "Arbitrum" if not TESTNET else "Arbitrum Testnet",
@@ -133,14 +204,15 @@ def wallet_setup(
     else:  # info
         try:
             trader = get_trader()
-            balance = trader.get_balance()
-            wallet_info = wallet_manager.get_wallet_info(trader.address)
+            balance = await asyncio.to_thread(trader.get_balance)
+            address = trader.address
+            wallet_info = wallet_manager.get_wallet_info(address) if address is not None else {}
             
             return [types.TextContent(
                 type="text",
-                text=json.dumps({
+                text=_dumps({
                     "action": "info",
-                    "address": trader.address,
+                    "address": address,
                     "balance": balance.total,
                     "available": balance.available,
                     "margin_used": balance.margin_used,
@@ -153,7 +225,7 @@ def wallet_setup(
         except Exception as e:
             return [types.TextContent(
                 type="text",
-                text=json.dumps({
+                text=_dumps({
                     "action": "info",
                     "error": str(e),
                     "message": "⚠️ No wallet configured. Run wallet_setup with action=create"
@@ -166,7 +238,7 @@ def wallet_setup(
 # ============================================================================
 
 @mcp.tool()
-def market_order(
+async def market_order(
     symbol: str,
     side: str,
     size_usd: float,
@@ -188,9 +260,10 @@ def market_order(
     try:
         trader = get_trader()
         
-        order = trader.market_order(
+        order = await asyncio.to_thread(
+            trader.market_order,
             symbol=symbol,
-            side=OrderSide(side.lower()),
+            side=side,
             size_usd=size_usd,
             slippage_bps=slippage_bps,
             stop_loss_pct=stop_loss_pct,
@@ -199,14 +272,14 @@ def market_order(
         
         return [types.TextContent(
             type="text",
-            text=json.dumps({
+            text=_dumps({
                 "order_id": order.id,
                 "symbol": order.symbol,
                 "side": order.side.value,
                 "size": order.size,
                 "entry_price": order.average_price,
                 "fees_usd": order.fees,
-                "timestamp": order.timestamp.isoformat(),
+                "timestamp": order.timestamp,
                 "message": f"✅ {order.side.value.title()} {order.symbol}: ${size_usd} @ ${order.average_price:.2f}"
             })
         )]
@@ -214,7 +287,7 @@ def market_order(
     except Exception as e:
         return [types.TextContent(
             type="text",
-            text=json.dumps({
+            text=_dumps({
                 "error": str(e),
                 "message": f"❌ Order failed: {str(e)}"
             })
@@ -222,7 +295,7 @@ def market_order(
 
 
 @mcp.tool(meta={"ui": {"resourceUri": VIEW_POSITION}})
-def get_position(symbol: str) -> list[types.TextContent]:
+async def get_position(symbol: str) -> list[types.TextContent]:
     """
     Get detailed position information with interactive chart.
     
@@ -231,12 +304,12 @@ def get_position(symbol: str) -> list[types.TextContent]:
     """
     try:
         trader = get_trader()
-        position = trader.get_position(symbol)
+        position = await asyncio.to_thread(trader.get_position, symbol)
         
         if not position:
             return [types.TextContent(
                 type="text",
-                text=json.dumps({
+                text=_dumps({
                     "error": "Position not found",
                     "symbol": symbol,
                     "message": f"📊 No open position for {symbol}"
@@ -244,11 +317,11 @@ def get_position(symbol: str) -> list[types.TextContent]:
             )]
         
         # Get price history for chart
-        price_history = trader.get_price_history(symbol, hours=4)
+        price_history = await asyncio.to_thread(trader.get_price_history, symbol, hours=4)
         
         return [types.TextContent(
             type="text",
-            text=json.dumps({
+            text=_dumps({
                 "symbol": position.symbol,
                 "side": position.side.value,
                 "size": position.size,
@@ -267,7 +340,7 @@ def get_position(symbol: str) -> list[types.TextContent]:
     except Exception as e:
         return [types.TextContent(
             type="text",
-            text=json.dumps({
+            text=_dumps({
                 "error": str(e),
                 "message": f"❌ Failed to get position: {str(e)}"
             })
@@ -275,7 +348,7 @@ def get_position(symbol: str) -> list[types.TextContent]:
 
 
 @mcp.tool(meta={"ui": {"resourceUri": VIEW_DASHBOARD}})
-def get_dashboard(refresh_interval: int = 5) -> list[types.TextContent]:
+async def get_dashboard(refresh_interval: int = 5) -> list[types.TextContent]:
     """
     Get interactive portfolio dashboard.
     
@@ -283,15 +356,24 @@ def get_dashboard(refresh_interval: int = 5) -> list[types.TextContent]:
         refresh_interval: Auto-refresh interval in seconds (0 = disabled)
     """
     try:
-        trader = get_trader()
+        key, trader = _trader_entry()
+        
+        balance, positions, balance_history = await asyncio.gather(
+            asyncio.to_thread(trader.get_balance),
+            asyncio.to_thread(trader.get_all_positions),
+            asyncio.to_thread(_balance_history_json, key, trader, days=7),
+        )
         
-        balance = trader.get_balance()
-        positions = trader.get_all_positions()
-        balance_history = trader.get_balance_history(days=7)
+        n = len(positions)
+        pnl_pcts = pnl_pct_vec(
+            np.fromiter((p.unrealized_pnl for p in positions), dtype=np.float64, count=n),
+            np.fromiter((p.size for p in positions), dtype=np.float64, count=n),
+            np.fromiter((p.entry_price for p in positions), dtype=np.float64, count=n),
+        ).tolist()
         
         return [types.TextContent(
             type="text",
-            text=json.dumps({
+            text=_dumps({
                 "balance": {
                     "total": balance.total,
                     "available": balance.available,
@@ -306,9 +388,9 @@ def get_dashboard(refresh_interval: int = 5) -> list[types.TextContent]:
                         "entry_price": p.entry_price,
                         "mark_price": p.mark_price,
                         "unrealized_pnl": p.unrealized_pnl,
-                        "unrealized_pnl_pct": (p.unrealized_pnl / (p.size * p.entry_price) * 100)
+                        "unrealized_pnl_pct": pct
                     }
-                    for p in positions
+                    for p, pct in zip(positions, pnl_pcts)
                 ],
                 "balance_history": balance_history,
                 "refresh_interval": refresh_interval,
@@ -319,7 +401,7 @@ def get_dashboard(refresh_interval: int = 5) -> list[types.TextContent]:
     except Exception as e:
         return [types.TextContent(
             type="text",
-            text=json.dumps({
+            text=_dumps({
                 "error": str(e),
                 "message": f"❌ Failed to get dashboard: {str(e)}"
             })
@@ -327,7 +409,7 @@ def get_dashboard(refresh_interval: int = 5) -> list[types.TextContent]:
 
 
 @mcp.tool()
-def close_position(
+async def close_position(
     symbol: str,
     slippage_bps: int = 50
 ) -> list[types.TextContent]:
@@ -340,11 +422,11 @@ def close_position(
     """
     try:
         trader = get_trader()
-        order = trader.close_position(symbol, slippage_bps=slippage_bps)
+        order = await asyncio.to_thread(trader.close_position, symbol, slippage_bps=slippage_bps)
         
         return [types.TextContent(
             type="text",
-            text=json.dumps({
+            text=_dumps({
                 "order_id": order.id,
                 "symbol": order.symbol,
                 "size": order.size,
@@ -358,7 +440,7 @@ def close_position(
     except Exception as e:
         return [types.TextContent(
             type="text",
-            text=json.dumps({
+            text=_dumps({
                 "error": str(e),
                 "message": f"❌ Failed to close position: {str(e)}"
             })
@@ -366,15 +448,15 @@ def close_position(
 
 
 @mcp.tool()
-def get_balance() -> list[types.TextContent]:
+async def get_balance() -> list[types.TextContent]:
     """Get account balance and margin info."""
     try:
         trader = get_trader()
-        balance = trader.get_balance()
+        balance = await asyncio.to_thread(trader.get_balance)
         
         return [types.TextContent(
             type="text",
-            text=json.dumps({
+            text=_dumps({
                 "total": balance.total,
                 "available": balance.available,
                 "margin_used": balance.margin_used,
@@ -387,7 +469,7 @@ def get_balance() -> list[types.TextContent]:
     except Exception as e:
         return [types.TextContent(
             type="text",
-            text=json.dumps({
+            text=_dumps({
                 "error": str(e),
                 "message": f"❌ Failed to get balance: {str(e)}"
             })
@@ -395,7 +477,7 @@ def get_balance() -> list[types.TextContent]:
 
 
 @mcp.tool()
-def get_market_data(symbol: str) -> list[types.TextContent]:
+async def get_market_data(symbol: str) -> list[types.TextContent]:
     """
     Get current market data.
     
@@ -404,29 +486,29 @@ def get_market_data(symbol: str) -> list[types.TextContent]:
     """
     try:
         trader = get_trader()
-        market = trader.get_market_data(symbol)
+        market = await asyncio.to_thread(trader.get_market_data, symbol)
         
         return [types.TextContent(
             type="text",
-            text=json.dumps({
+            text=_dumps({
                 "symbol": market.symbol,
                 "mark_price": market.mark_price,
                 "index_price": market.index_price,
                 "funding_rate": market.funding_rate,
-                "funding_rate_annual": market.funding_rate * 365 * 3 * 100,  # Approximate
+                "funding_rate_annual": market.funding_rate_annual,  # Approximate
                 "open_interest": market.open_interest,
                 "volume_24h": market.volume_24h,
                 "high_24h": market.high_24h,
                 "low_24h": market.low_24h,
                 "change_24h": market.change_24h,
-                "message": f"📊 {symbol}: ${market.mark_price:.2f} | Funding: {market.funding_rate*100:.4f}%"
+                "message": f"📊 {symbol}: ${market.mark_price:.2f} | Funding: {market.funding_rate_pct:.4f}%"
             })
         )]
     
     except Exception as e:
         return [types.TextContent(
             type="text",
-            text=json.dumps({
+            text=_dumps({
                 "error": str(e),
                 "message": f"❌ Failed to get market data: {str(e)}"
             })
@@ -459,17 +541,17 @@ def configure_risk(
         if max_daily_loss_usd:
             trader.risk_manager.limits.max_daily_loss_usd = max_daily_loss_usd
         if allowed_symbols is not None:
-            trader.risk_manager.limits.allowed_symbols = allowed_symbols
+            trader.risk_manager.limits.allowed_symbols = frozenset(allowed_symbols)
         
         limits = trader.risk_manager.limits
         
         return [types.TextContent(
             type="text",
-            text=json.dumps({
+            text=_dumps({
                 "max_position_size_usd": limits.max_position_size_usd,
                 "max_leverage": limits.max_leverage,
                 "max_daily_loss_usd": limits.max_daily_loss_usd,
-                "allowed_symbols": limits.allowed_symbols or [],
+                "allowed_symbols": sorted(limits.allowed_symbols or ()),
                 "current_daily_loss": trader.risk_manager.daily_pnl,
                 "circuit_breaker_active": trader.risk_manager.daily_pnl < -limits.max_daily_loss_usd,
                 "message": f"🛡️ Risk limits updated: ${limits.max_position_size_usd:.0f} max, {limits.max_leverage}x leverage"
@@ -479,7 +561,7 @@ def configure_risk(
     except Exception as e:
         return [types.TextContent(
             type="text",
-            text=json.dumps({
+            text=_dumps({
                 "error": str(e),
                 "message": f"❌ Failed to configure risk: {str(e)}"
             })
@@ -490,6 +572,22 @@ def configure_risk(
 # UI RESOURCES
 # ============================================================================
 
+def _load_views() -> dict[str, str]:
+    """Read every bundled HTML view once, keyed by file name."""
+    try:
+        entries = list(resources.files("unju_perps").joinpath("views").iterdir())
+    except FileNotFoundError:
+        return {}
+    return {
+        entry.name: entry.read_text(encoding="utf-8")
+        for entry in entries
+        if entry.name.endswith(".html")
+    }
+
+
+_VIEWS = _load_views()
+
+
 @mcp.resource(
     VIEW_WALLET,
     mime_type="text/html;profile=mcp-app",
@@ -497,11 +595,10 @@ def configure_risk(
 )
 def wallet_view() -> str:
     """Wallet setup UI."""
-    try:
-        with open(os.path.join(os.path.dirname(__file__), "views", "wallet.html")) as f:
-            return f.read()
-    except FileNotFoundError:
-        return "<html><body><h1>Wallet Setup View</h1><p>Coming soon...</p></body></html>"
+    return _VIEWS.get(
+        "wallet.html",
+        "<html><body><h1>Wallet Setup View</h1><p>Coming soon...</p></body></html>"
+    )
 
 
 @mcp.resource(
@@ -511,11 +608,10 @@ def wallet_view() -> str:
 )
 def dashboard_view() -> str:
     """Interactive dashboard UI."""
-    try:
-        with open(os.path.join(os.path.dirname(__file__), "views", "dashboard.html")) as f:
-            return f.read()
-    except FileNotFoundError:
-        return "<html><body><h1>Dashboard View</h1><p>Coming soon...</p></body></html>"
+    return _VIEWS.get(
+        "dashboard.html",
+        "<html><body><h1>Dashboard View</h1><p>Coming soon...</p></body></html>"
+    )
 
 
 @mcp.resource(
@@ -525,11 +621,10 @@ def dashboard_view() -> str:
 )
 def position_view() -> str:
     """Position detail UI."""
-    try:
-        with open(os.path.join(os.path.dirname(__file__), "views", "position.html")) as f:
-            return f.read()
-    except FileNotFoundError:
-        return "<html><body><h1>Position View</h1><p>Coming soon...</p></body></html>"
+    return _VIEWS.get(
+        "position.html",
+        "<html><body><h1>Position View</h1><p>Coming soon...</p></body></html>"
+    )
 
 
 @mcp.resource(
@@ -539,11 +634,10 @@ def position_view() -> str:
 )
 def risk_view() -> str:
     """Risk configuration UI."""
-    try:
-        with open(os.path.join(os.path.dirname(__file__), "views", "risk.html")) as f:
-            return f.read()
-    except FileNotFoundError:
-        return "<html><body><h1>Risk Config View</h1><p>Coming soon...</p></body></html>"
+    return _VIEWS.get(
+        "risk.html",
+        "<html><body><h1>Risk Config View</h1><p>Coming soon...</p></body></html>"
+    )
 
 
 # ============================================================================
@@ -563,7 +657,7 @@ def main():
         app = mcp.streamable_http_app()
         app.add_middleware(
             CORSMiddleware,
-            allow_origins=["*"],
+            allow_origins=CORS_ORIGINS,
             allow_methods=["*"],
             allow_headers=["*"],
         )
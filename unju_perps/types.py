@@ -1,9 +1,13 @@
 """Type definitions for unju-perps"""
 
+import sys
+from dataclasses import dataclass, field
 from enum import Enum
 from typing import Optional
 from datetime import datetime
-from pydantic import BaseModel, Field
+
+# ``slots=True`` is only accepted by ``dataclass`` on Python 3.10+
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
 
 class OrderSide(str, Enum):
@@ -30,37 +34,47 @@ class OrderStatus(str, Enum):
     REJECTED = "rejected"
 
 
-class Order(BaseModel):
+@dataclass(frozen=True, **_SLOTS)
+class Order:
     """Order representation"""
     id: str
     symbol: str
     side: OrderSide
     type: OrderType
     size: float
+    status: OrderStatus
+    timestamp: datetime
     price: Optional[float] = None
     filled_size: float = 0.0
     average_price: Optional[float] = None
-    status: OrderStatus
-    timestamp: datetime
     fees: float = 0.0
 
 
-class Position(BaseModel):
+@dataclass(**_SLOTS)
+class Position:
     """Position representation"""
     symbol: str
     side: OrderSide
     size: float
     entry_price: float
     mark_price: float
-    liquidation_price: Optional[float] = None
     leverage: float
     unrealized_pnl: float
-    realized_pnl: float = 0.0
     margin: float
     timestamp: datetime
+    liquidation_price: Optional[float] = None
+    realized_pnl: float = 0.0
+    # +1.0 for long, -1.0 for short, so PnL is side_sign * (mark - entry) * size
+    side_sign: float = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        # Dataclasses don't coerce, so accept "long"/"short" like the old model
+        self.side = OrderSide(self.side)
+        self.side_sign = 1.0 if self.side is OrderSide.LONG else -1.0
 
 
-class Market(BaseModel):
+@dataclass(frozen=True, **_SLOTS)
+class Market:
     """Market data"""
     symbol: str
     mark_price: float
@@ -72,9 +86,17 @@ class Market(BaseModel):
     low_24h: float
     change_24h: float
     timestamp: datetime
+    # Funding rate as a percentage, per period and annualized (3 periods a day)
+    funding_rate_pct: float = field(init=False, repr=False, compare=False)
+    funding_rate_annual: float = field(init=False, repr=False, compare=False)
+    
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "funding_rate_pct", self.funding_rate * 100.0)
+        object.__setattr__(self, "funding_rate_annual", self.funding_rate * 109500.0)
 
 
-class Balance(BaseModel):
+@dataclass(frozen=True, **_SLOTS)
+class Balance:
     """Account balance"""
     total: float
     available: float
@@ -83,10 +105,42 @@ class Balance(BaseModel):
     timestamp: datetime
 
 
-class RiskLimits(BaseModel):
+@dataclass(**_SLOTS)
+class RiskLimits:
     """Risk management limits"""
-    max_position_size_usd: float = Field(default=10000.0, ge=0)
-    max_leverage: float = Field(default=10.0, ge=1.0, le=50.0)
-    max_daily_loss_usd: float = Field(default=1000.0, ge=0)
-    max_open_orders: int = Field(default=10, ge=1)
-    allowed_symbols: Optional[list[str]] = None
+    max_position_size_usd: float = 10000.0
+    max_leverage: float = 10.0
+    max_daily_loss_usd: float = 1000.0
+    max_open_orders: int = 10
+    allowed_symbols: Optional[frozenset[str]] = None
+    
+    def __post_init__(self) -> None:
+        if self.max_position_size_usd < 0:
+            raise ValueError("max_position_size_usd must be >= 0")
+        if not 1.0 <= self.max_leverage <= 50.0:
+            raise ValueError("max_leverage must be between 1 and 50")
+        if self.max_daily_loss_usd < 0:
+            raise ValueError("max_daily_loss_usd must be >= 0")
+        if self.max_open_orders < 1:
+            raise ValueError("max_open_orders must be >= 1")
+        if self.allowed_symbols is not None:
+            self.allowed_symbols = frozenset(self.allowed_symbols)
+
+
+@dataclass(**_SLOTS)
+class WalletRecord:
+    """Stored wallet of a user"""
+    email: str
+    user_id: Optional[str]
+    address: str
+    private_key: bytes
+    created_at: datetime
+    next_rent_due: datetime
+    next_rent_due_ts: float  # next_rent_due as a UTC epoch timestamp
+    credits_remaining: int = 10  # Annual rent credits
+    active: bool = True
+    
+    @property
+    def private_key_hex(self) -> str:
+        """Private key as 0x prefixed hex, as PerpTrader expects."""
+        return "0x" + self.private_key.hex()
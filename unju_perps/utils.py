@@ -1,22 +1,40 @@
 """Utility functions"""
 
-from typing import Optional
+from functools import lru_cache
+from typing import Optional, Union
 import os
+import re
+import sys
+
+import numpy as np
+
+# Normalized private keys by environment variable name, read once per process
+_PK_CACHE: dict[str, Optional[str]] = {}
+
+# Quote currency suffix stripped by format_symbol
+_SUFFIX_RE = re.compile(r"(?:USDT|USD)$")
 
 
 def get_private_key_from_env(var_name: str = "HYPERLIQUID_PRIVATE_KEY") -> Optional[str]:
     """
     Load private key from environment variable.
     
+    The variable is read on the first call for each name and cached for
+    the life of the process.
+    
     Args:
         var_name: Environment variable name
     
     Returns:
         Private key string or None if not set
     """
+    if var_name in _PK_CACHE:
+        return _PK_CACHE[var_name]
+    
     key = os.getenv(var_name)
     if key and not key.startswith("0x"):
         key = f"0x{key}"
+    _PK_CACHE[var_name] = key
     return key
 
 
@@ -28,6 +46,8 @@ def calculate_position_size(
     """
     Calculate position size in contracts from USD notional.
     
+    Use calculate_position_size_batch to size many positions at once.
+    
     Args:
         notional_usd: Position size in USD
         entry_price: Entry price
@@ -39,6 +59,26 @@ def calculate_position_size(
     return (notional_usd * leverage) / entry_price
 
 
+def calculate_position_size_batch(
+    notional_usd: np.ndarray,
+    entry_price: np.ndarray,
+    leverage: Union[np.ndarray, float] = 1.0,
+) -> np.ndarray:
+    """
+    Calculate position sizes in contracts for many orders at once.
+    
+    Args:
+        notional_usd: Position sizes in USD
+        entry_price: Entry prices
+        leverage: Leverage multipliers, or one leverage for every order
+    
+    Returns:
+        Position sizes in contracts
+    """
+    sizes: np.ndarray = np.multiply(notional_usd, leverage) / entry_price
+    return sizes
+
+
 def calculate_liquidation_price(
     entry_price: float,
     leverage: float,
@@ -57,23 +97,42 @@ def calculate_liquidation_price(
     Returns:
         Estimated liquidation price
     """
-    if side.lower() == "long":
-        # Long liquidation: price drops
-        return entry_price * (1 - (1 / leverage) + maintenance_margin)
-    else:
-        # Short liquidation: price rises
-        return entry_price * (1 + (1 / leverage) - maintenance_margin)
+    # Long liquidation: price drops; short liquidation: price rises
+    sign = -1.0 if side[:1] in ("l", "L") else 1.0
+    return entry_price * (1.0 + sign * (1.0 / leverage - maintenance_margin))
+
+
+def calculate_liquidation_price_batch(
+    entry_prices: np.ndarray,
+    leverages: np.ndarray,
+    side_signs: np.ndarray,
+    maintenance_margin: float = 0.005,
+) -> np.ndarray:
+    """
+    Estimate liquidation prices for many positions at once.
+    
+    Args:
+        entry_prices: Entry prices
+        leverages: Leverage multipliers
+        side_signs: +1.0 for long, -1.0 for short (as Position.side_sign)
+        maintenance_margin: Maintenance margin rate
+    
+    Returns:
+        Estimated liquidation prices
+    """
+    return entry_prices * (1.0 - side_signs * (1.0 / leverages - maintenance_margin))
 
 
+@lru_cache(maxsize=512)
 def format_symbol(symbol: str) -> str:
     """
     Normalize symbol format.
     
     Args:
-        symbol: Raw symbol (e.g., "BTC", "btc", "BTCUSD")
+        symbol: Raw symbol (e.g., "BTC", "btc", "BTCUSD", "BTC-USDT")
     
     Returns:
-        Normalized symbol
+        Normalized symbol, interned so dict lookups keyed by it can match
+        on identity
     """
-    symbol = symbol.upper().replace("USD", "").replace("USDT", "").replace("-", "")
-    return symbol
+    return sys.intern(_SUFFIX_RE.sub("", symbol.upper().replace("-", "")))
@@ -2,15 +2,67 @@
 Wallet management using Magic + unju credits system
 """
 import os
-import json
-from typing import Optional, Dict, Any
-from datetime import datetime, timedelta
+import queue
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import asdict
+from typing import Optional, Dict, Any, List
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import orjson
 from eth_account import Account
+from eth_account.signers.local import LocalAccount
+
+from .types import WalletRecord
 
 # TODO: Import actual Magic SDK and unju-python SDK
 # from magic_admin import Magic
 # from unju import CreditsClient
 
+# Number of pre-generated accounts kept ready for create_wallet
+_KEY_POOL_SIZE = 64
+
+# Accounts generated ahead of time by one daemon thread shared by every
+# WalletManager, started on the first create_wallet so merely importing
+# the module doesn't spawn it
+_key_pool: "queue.Queue[LocalAccount]" = queue.Queue(maxsize=_KEY_POOL_SIZE)
+_key_pool_thread: Optional[threading.Thread] = None
+_key_pool_lock = threading.Lock()
+
+
+def _fill_key_pool() -> None:
+    """Keep the key pool topped up (runs forever on a daemon thread)."""
+    while True:
+        _key_pool.put(Account.create())
+
+
+def _next_account() -> LocalAccount:
+    """Take a pre-generated account, or create one if the pool is empty."""
+    global _key_pool_thread
+    if _key_pool_thread is None:
+        with _key_pool_lock:
+            if _key_pool_thread is None:
+                _key_pool_thread = threading.Thread(
+                    target=_fill_key_pool, name="wallet-key-pool", daemon=True
+                )
+                _key_pool_thread.start()
+    
+    try:
+        return _key_pool.get_nowait()
+    except queue.Empty:
+        account: LocalAccount = Account.create()
+        return account
+
+
+def _record_info(record: WalletRecord) -> Dict[str, Any]:
+    """Wallet record as a dict: key hex-encoded, timestamps UTC ISO 8601."""
+    info = asdict(record)
+    info["private_key"] = record.private_key_hex
+    info["created_at"] = record.created_at.isoformat()
+    info["next_rent_due"] = record.next_rent_due.isoformat()
+    return info
+
 
 class WalletManager:
     """
@@ -18,16 +70,45 @@ class WalletManager:
     Charges unju credits for wallet creation and rent.
     """
     
-    def __init__(self):
+    def __init__(self, max_wallets: Optional[int] = None):
+        """
+        Initialize WalletManager.
+        
+        Args:
+            max_wallets: Keep at most this many wallets in memory, evicting
+                the least recently used (default: unbounded). Evicted
+                wallets are forgotten, private key included, so only set
+                this when records are persisted elsewhere.
+        """
         # Initialize Magic (TODO: use actual Magic SDK)
         self.magic_api_key = os.getenv("MAGIC_API_KEY")
         # self.magic = Magic(api_secret_key=self.magic_api_key)
         
+        # Address of the wallet configured through the environment, if any
+        self._hl_address = os.getenv("HYPERLIQUID_ADDRESS")
+        self._env_wallet_info: Optional[Dict[str, Any]] = None
+        
         # Initialize unju credits client (TODO: use actual SDK)
         # self.credits = CreditsClient()
         
-        # For now, store wallet info in memory (TODO: use database)
-        self.wallets: Dict[str, Dict[str, Any]] = {}
+        # For now, store wallet info in memory (TODO: use database),
+        # least recently used first
+        self.wallets: OrderedDict[str, WalletRecord] = OrderedDict()
+        self.max_wallets = max_wallets
+        
+        # Wallet address by owner email and by user ID
+        self._by_email: Dict[str, str] = {}
+        self._by_user: Dict[str, str] = {}
+        
+        # Rent due timestamps with one row per wallet (address in _addresses),
+        # so finding every wallet that owes rent is one array compare
+        self._addresses: List[str] = []
+        self._rows: Dict[str, int] = {}
+        self._rent_due_ts = np.zeros(16)
+        
+        # Guards the store, its indexes and the rent rows, which create_wallet
+        # updates together from worker threads, and the LRU order lookups touch
+        self._lock = threading.Lock()
     
     def create_wallet(self, email: str, user_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -52,24 +133,40 @@ class WalletManager:
         # address = wallet.public_address
         
         # For now, create a test wallet
-        account = Account.create()
+        account = _next_account()
         address = account.address
-        private_key = account.key.hex()
+        private_key = bytes(account.key)
         
         # Calculate next rent due (1 year from now)
-        next_rent_due = datetime.utcnow() + timedelta(days=365)
+        now = datetime.now(timezone.utc)
+        next_rent_due = now + timedelta(days=365)
+        
+        record = WalletRecord(
+            email=email,
+            user_id=user_id,
+            address=address,
+            private_key=private_key,  # TODO: Store securely in Magic
+            created_at=now,
+            next_rent_due=next_rent_due,
+            next_rent_due_ts=next_rent_due.timestamp(),
+        )
         
         # Store wallet info
-        self.wallets[address] = {
-            "email": email,
-            "user_id": user_id,
-            "address": address,
-            "private_key": private_key,  # TODO: Store securely in Magic
-            "created_at": datetime.utcnow().isoformat(),
-            "next_rent_due": next_rent_due.isoformat(),
-            "credits_remaining": 10,  # Annual rent credits
-            "active": True
-        }
+        with self._lock:
+            self.wallets[address] = record
+            self._by_email[email] = address
+            if user_id is not None:
+                self._by_user[user_id] = address
+            
+            row = len(self._addresses)
+            if row == len(self._rent_due_ts):
+                self._rent_due_ts = np.concatenate((self._rent_due_ts, np.zeros(row)))
+            self._rent_due_ts[row] = record.next_rent_due_ts
+            self._addresses.append(address)
+            self._rows[address] = row
+            
+            if self.max_wallets is not None and len(self.wallets) > self.max_wallets:
+                self._evict_oldest()
         
         # TODO: Charge 1 credit for wallet creation
         # self.credits.charge(user_id, amount=1, reason="Wallet creation")
@@ -80,31 +177,80 @@ class WalletManager:
             "credits_charged": 1
         }
     
+    def _touch(self, address: str) -> None:
+        """Mark a wallet as recently used when the store is bounded (lock held)."""
+        if self.max_wallets is not None:
+            self.wallets.move_to_end(address)
+    
+    def _evict_oldest(self) -> None:
+        """Drop the least recently used wallet from the store and its indexes (lock held)."""
+        address, record = self.wallets.popitem(last=False)
+        if self._by_email.get(record.email) == address:
+            del self._by_email[record.email]
+        if record.user_id is not None and self._by_user.get(record.user_id) == address:
+            del self._by_user[record.user_id]
+        
+        # Move the last rent row into the freed one to keep rows contiguous
+        row = self._rows.pop(address)
+        last = self._addresses.pop()
+        if last != address:
+            self._addresses[row] = last
+            self._rows[last] = row
+            self._rent_due_ts[row] = self._rent_due_ts[len(self._addresses)]
+    
     def get_wallet_info(self, address: str) -> Dict[str, Any]:
         """Get wallet information."""
-        wallet_info = self.wallets.get(address, {})
+        with self._lock:
+            record = self.wallets.get(address)
+            if record is not None:
+                self._touch(address)
+                return _record_info(record)
         
-        if not wallet_info:
-            # Check if wallet exists from env var
-            if address == os.getenv("HYPERLIQUID_ADDRESS"):
-                return {
+        # Check if wallet exists from env var
+        if address == self._hl_address:
+            if self._env_wallet_info is None:
+                self._env_wallet_info = {
                     "address": address,
                     "active": True,
                     "credits_remaining": 999,
-                    "next_rent_due": (datetime.utcnow() + timedelta(days=365)).isoformat(),
+                    "next_rent_due": (datetime.now(timezone.utc) + timedelta(days=365)).isoformat(),
                     "source": "environment"
                 }
+            # Copy so callers that add keys don't alter the cached dict
+            return dict(self._env_wallet_info)
+        return {}
+    
+    def wallet_json(self, address: str) -> bytes:
+        """
+        Serialize a stored wallet for the wire.
         
-        return wallet_info
+        Args:
+            address: Wallet address
+        
+        Returns:
+            UTF-8 JSON of the wallet record without its private key,
+            timestamps as UTC ISO 8601
+        
+        Raises:
+            KeyError: If the wallet doesn't exist
+        """
+        info = _record_info(self.wallets[address])
+        del info["private_key"]
+        return orjson.dumps(info)
     
     def check_rent_due(self, address: str) -> bool:
         """Check if wallet rent is due."""
-        wallet_info = self.wallets.get(address)
-        if not wallet_info:
+        record = self.wallets.get(address)
+        if record is None:
             return False
         
-        next_rent_due = datetime.fromisoformat(wallet_info["next_rent_due"])
-        return datetime.utcnow() >= next_rent_due
+        return time.time() >= record.next_rent_due_ts
+    
+    def due_wallets(self) -> List[str]:
+        """Addresses of every wallet whose rent is due."""
+        with self._lock:
+            due = np.flatnonzero(self._rent_due_ts[:len(self._addresses)] <= time.time())
+            return [self._addresses[i] for i in due.tolist()]
     
     def charge_rent(self, address: str, user_id: Optional[str] = None) -> Dict[str, Any]:
         """
@@ -120,8 +266,8 @@ class WalletManager:
         Raises:
             Exception: If insufficient credits
         """
-        wallet_info = self.wallets.get(address)
-        if not wallet_info:
+        record = self.wallets.get(address)
+        if record is None:
             raise Exception("Wallet not found")
         
         # TODO: Check user has at least 10 credits
@@ -132,11 +278,16 @@ class WalletManager:
         # self.credits.charge(user_id, amount=10, reason="Wallet annual rent")
         
         # Update next rent due
-        next_rent_due = datetime.utcnow() + timedelta(days=365)
-        wallet_info["next_rent_due"] = next_rent_due.isoformat()
-        wallet_info["credits_remaining"] = 10
+        next_rent_due = datetime.now(timezone.utc) + timedelta(days=365)
+        record.next_rent_due = next_rent_due
+        record.next_rent_due_ts = next_rent_due.timestamp()
+        record.credits_remaining = 10
+        with self._lock:
+            row = self._rows.get(address)
+            if row is not None:
+                self._rent_due_ts[row] = record.next_rent_due_ts
         
-        return wallet_info
+        return _record_info(record)
     
     def get_or_create_wallet(
         self,
@@ -145,9 +296,14 @@ class WalletManager:
     ) -> Dict[str, Any]:
         """Get existing wallet or create new one."""
         # Check if user already has a wallet
-        for address, info in self.wallets.items():
-            if info.get("email") == email or info.get("user_id") == user_id:
-                return info
+        with self._lock:
+            address = self._by_user.get(user_id) if user_id is not None else None
+            if address is None:
+                address = self._by_email.get(email)
+            record = self.wallets.get(address) if address is not None else None
+            if record is not None:
+                self._touch(record.address)
+                return _record_info(record)
         
         # Create new wallet
         return self.create_wallet(email, user_id)